@@ -47,16 +47,189 @@ export async function renderWidgets(
   );
   await Promise.all(
     Array.from(tags).map(async (t) =>
-      renderManager(element, JSON.parse(t.innerHTML), managerFactory)
+      renderManager(element, await readWidgetState(t), managerFactory, t.id)
     )
   );
 }
 
+/**
+ * Read the widget state JSON in a script tag.
+ *
+ * The state is plain JSON, or gzip-compressed and base64-encoded when the
+ * tag has a `data-encoding="gzip+base64"` attribute.
+ */
+async function readWidgetState(tag: Element): Promise<unknown> {
+  const encoding = tag.getAttribute('data-encoding');
+  if (encoding === null) {
+    return JSON.parse(tag.innerHTML);
+  }
+  if (encoding !== 'gzip+base64') {
+    throw new Error(`Unsupported widget state encoding: ${encoding}`);
+  }
+  const binary = atob(tag.innerHTML.trim());
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i);
+  }
+  // DecompressionStream is not in the DOM typings of our TypeScript version
+  const decompressor = new (window as any).DecompressionStream('gzip');
+  const stream = new Blob([bytes]).stream().pipeThrough(decompressor);
+  return JSON.parse(await new Response(stream).text());
+}
+
+/**
+ * Return a promise resolving when an element scrolls into the page.
+ *
+ * Resolves immediately if IntersectionObserver is not available.
+ */
+function whenVisible(element: HTMLElement): Promise<void> {
+  if (typeof IntersectionObserver === 'undefined') {
+    return Promise.resolve();
+  }
+  return new Promise((resolve) => {
+    const observer = new IntersectionObserver((entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) {
+        observer.disconnect();
+        resolve();
+      }
+    });
+    observer.observe(element);
+  });
+}
+
+/**
+ * Decode a base64 or hex encoded buffer.
+ */
+function decodeBuffer(encoding: string, data: string): ArrayBuffer {
+  if (encoding === 'hex') {
+    const bytes = new Uint8Array(data.length / 2);
+    for (let i = 0; i < bytes.length; i++) {
+      bytes[i] = parseInt(data.substr(2 * i, 2), 16);
+    }
+    return bytes.buffer;
+  }
+  const binary = atob(data);
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i);
+  }
+  return bytes.buffer;
+}
+
+/**
+ * Resolve the buffers that are not stored inline in the model states.
+ *
+ * Buffers with the 'url' encoding are loaded from their URL, relative to the
+ * document, and buffers with the 'shared' encoding are looked up in the
+ * shared buffer table of the manager state. They are then put back in the
+ * model state. Each file and each shared buffer is loaded once, and models
+ * referring to the same shared buffer get the same data.
+ *
+ * @param widgetState The widget manager state, modified in place.
+ */
+async function resolveExternalBuffers(
+  widgetState: IManagerState
+): Promise<void> {
+  const files = new Map<string, Promise<ArrayBuffer>>();
+  const fetchFile = (url: string): Promise<ArrayBuffer> => {
+    let file = files.get(url);
+    if (file === undefined) {
+      file = fetch(new URL(url, document.baseURI).href).then((response) => {
+        if (!response.ok) {
+          throw new Error(
+            `Could not load widget buffer ${url}: ${response.status}`
+          );
+        }
+        return response.arrayBuffer();
+      });
+      files.set(url, file);
+    }
+    return file;
+  };
+  const loadBuffer = async (b: any): Promise<DataView> => {
+    if (b.encoding !== 'url') {
+      return new DataView(decodeBuffer(b.encoding, b.data));
+    }
+    const file = await fetchFile(b.data);
+    const offset = b.offset ?? 0;
+    const length = b.length ?? file.byteLength - offset;
+    return new DataView(file, offset, length);
+  };
+  const table: { [hash: string]: any } = (widgetState as any).buffers || {};
+  const shared = new Map<string, Promise<DataView>>();
+  const loadShared = (hash: string): Promise<DataView> => {
+    let buffer = shared.get(hash);
+    if (buffer === undefined) {
+      if (!(hash in table)) {
+        throw new Error(`Unknown shared widget buffer ${hash}`);
+      }
+      buffer = loadBuffer(table[hash]);
+      shared.set(hash, buffer);
+    }
+    return buffer;
+  };
+
+  await Promise.all(
+    Object.values(widgetState.state).map(async (model: any) => {
+      if (!model.buffers) {
+        return;
+      }
+      const isExternal = (b: any): boolean =>
+        b.encoding === 'url' || b.encoding === 'shared';
+      const external = model.buffers.filter(isExternal);
+      if (external.length === 0) {
+        return;
+      }
+      model.buffers = model.buffers.filter((b: any) => !isExternal(b));
+      if (model.buffers.length === 0) {
+        delete model.buffers;
+      }
+      const buffers = await Promise.all(
+        external.map((b: any) =>
+          b.encoding === 'shared' ? loadShared(b.data) : loadBuffer(b)
+        )
+      );
+      // Put the buffers at their path in the state, as `put_buffers` does
+      external.forEach((b: any, i: number) => {
+        const path: (string | number)[] = b.path;
+        let obj = model.state;
+        for (let j = 0; j < path.length - 1; j++) {
+          obj = obj[path[j]];
+        }
+        obj[path[path.length - 1]] = buffers[i];
+      });
+    })
+  );
+}
+
+/**
+ * Load a state chunk and render its view once the view element is visible.
+ */
+async function renderChunk(
+  manager: HTMLManager,
+  chunk: Element,
+  model_id: string,
+  widgetTag: HTMLElement
+): Promise<void> {
+  await whenVisible(widgetTag);
+  const chunkState = await readWidgetState(chunk);
+  if (!model_validate(chunkState)) {
+    throw new Error(`Model state has errors: ${model_validate.errors}`);
+  }
+  await resolveExternalBuffers(chunkState);
+  await manager.set_state(chunkState);
+  if (manager.has_model(model_id)) {
+    const view = await manager.create_view(await manager.get_model(model_id));
+    manager.display_view(view, widgetTag);
+  }
+}
+
 /**
  * Create a widget manager for a given widget state.
  *
  * @param element The DOM element to search for widget view state script tags
  * @param widgetState The widget manager state
+ * @param stateId The id of the script tag holding the widget manager state
  *
  * #### Notes
  *
@@ -65,16 +238,26 @@ export async function renderWidgets(
  * model id the manager knows about is replaced with a rendered view.
  * Additionally, if the script tag has a prior img sibling with class
  * 'jupyter-widget', then that img tag is deleted.
+ *
+ * A view script tag may be preceded by a script tag with type
+ * "application/vnd.jupyter.widget-state-chunk+json", holding the state of
+ * the models only used by that view, and whose
+ * "data-jupyter-widgets-state" attribute is the id of the widget manager
+ * state script tag. The chunk is loaded and the view rendered when the view
+ * scrolls into the page. The returned promise does not wait for these
+ * views, whose errors are logged to the console.
  */
 async function renderManager(
   element: HTMLElement,
   widgetState: unknown,
-  managerFactory: () => HTMLManager
+  managerFactory: () => HTMLManager,
+  stateId = ''
 ): Promise<void> {
   const valid = model_validate(widgetState);
   if (!valid) {
     throw new Error(`Model state has errors: ${model_validate.errors}`);
   }
+  await resolveExternalBuffers(widgetState as IManagerState);
   const manager = managerFactory();
   const models = await manager.set_state(widgetState as IManagerState);
   const tags = element.querySelectorAll(
@@ -88,9 +271,34 @@ async function renderManager(
         throw new Error(`View state has errors: ${view_validate.errors}`);
       }
       const model_id: string = widgetViewObject.model_id;
+      const prev = viewtag.previousElementSibling;
+      if (
+        prev &&
+        prev.tagName === 'SCRIPT' &&
+        prev.getAttribute('type') ===
+          'application/vnd.jupyter.widget-state-chunk+json'
+      ) {
+        const chunk = prev;
+        if (
+          (chunk.getAttribute('data-jupyter-widgets-state') || '') !==
+            stateId ||
+          viewtag.parentElement === null
+        ) {
+          // the chunk belongs to another widget manager state
+          return;
+        }
+        const widgetTag = document.createElement('div');
+        widgetTag.className = 'widget-subarea';
+        viewtag.parentElement.insertBefore(widgetTag, viewtag);
+        // Views waiting to scroll into the page must not hold the returned
+        // promise, so their errors are reported on their own.
+        renderChunk(manager, chunk, model_id, widgetTag).catch((err) => {
+          console.error(`Could not render the widget ${model_id}`, err);
+        });
+        return;
+      }
       const model = models.find((item) => item.model_id == model_id);
       if (model !== undefined && viewtag.parentElement !== null) {
-        const prev = viewtag.previousElementSibling;
         if (
           prev &&
           prev.tagName === 'img' &&
@@ -13,6 +13,41 @@ import $ from 'jquery';
 
 import '../css/output.css';
 
+/**
+ * An output area model which can hold the outputs of a bounded output widget
+ * one to one: pushed outputs are not merged into the previous stream output,
+ * and the oldest outputs can be removed.
+ */
+class BoundedOutputAreaModel extends OutputAreaModel {
+  /**
+   * Append an output as an item of its own.
+   */
+  push(output: any): void {
+    const value = JSON.parse(JSON.stringify(output));
+    if (value.output_type === 'stream' && typeof value.text !== 'string') {
+      value.text = value.text.join('');
+    }
+    this.list.push(
+      this.contentFactory.createOutputModel({ value, trusted: this.trusted })
+    );
+  }
+
+  /**
+   * Remove the oldest outputs.
+   */
+  removeOldest(count: number): void {
+    count = Math.min(count, this.length);
+    if (count === 0) {
+      return;
+    }
+    const removed = Array.from({ length: count }, (_, i) => this.list.get(i));
+    this.list.removeRange(0, count);
+    for (const item of removed) {
+      item.dispose();
+    }
+  }
+}
+
 export class OutputModel extends outputBase.OutputModel {
   defaults(): Backbone.ObjectHash {
     return {
@@ -24,11 +59,26 @@ export class OutputModel extends outputBase.OutputModel {
 
   initialize(attributes: any, options: any): void {
     super.initialize(attributes, options);
-    this._outputs = new OutputAreaModel({ trusted: true });
+    this._outputs = new BoundedOutputAreaModel({ trusted: true });
     this.listenTo(this, 'change:outputs', this.setOutputs);
+    this.listenTo(this, 'msg:custom', this._handleMessage);
     this.setOutputs();
   }
 
+  /**
+   * Handle the outputs appended from the kernel, which only sends the new
+   * ones when max_outputs or max_bytes is set.
+   */
+  private _handleMessage(content: any): void {
+    if (content.method === 'append_outputs') {
+      for (const output of content.outputs) {
+        this._outputs.push(output);
+        this._outputs.removeOldest(this.appendBounded(output));
+      }
+      this.set('outputs', this._outputs.toJSON(), { newMessage: true });
+    }
+  }
+
   get outputs(): OutputAreaModel {
     return this._outputs;
   }
@@ -41,12 +91,21 @@ export class OutputModel extends outputBase.OutputModel {
     if (!(options && options.newMessage)) {
       // fromJSON does not clear the existing output
       this.clear_output();
-      // fromJSON does not copy the message, so we make a deep copy
-      this._outputs.fromJSON(JSON.parse(JSON.stringify(this.get('outputs'))));
+      const outputs = this.get('outputs');
+      if (this.isBounded()) {
+        // kept one to one with the outputs of the kernel, see _handleMessage
+        for (const output of outputs) {
+          this._outputs.push(output);
+        }
+      } else {
+        // fromJSON does not copy the message, so we make a deep copy
+        this._outputs.fromJSON(JSON.parse(JSON.stringify(outputs)));
+      }
+      this.resetBounds(outputs);
     }
   }
 
-  private _outputs: OutputAreaModel;
+  private _outputs: BoundedOutputAreaModel;
   widget_manager: HTMLManager;
 }
 
@@ -1,6 +1,16 @@
 import { DOMWidgetModel, DOMWidgetView } from '@jupyter-widgets/base';
 
-export const OUTPUT_WIDGET_VERSION = '1.0.0';
+export const OUTPUT_WIDGET_VERSION = '1.1.0';
+
+const encoder = new TextEncoder();
+
+/**
+ * The size in bytes of an output in its compact JSON form encoded as UTF-8,
+ * as counted against max_bytes, like the kernel does.
+ */
+function outputSize(output: unknown): number {
+  return encoder.encode(JSON.stringify(output)).length;
+}
 
 export class OutputModel extends DOMWidgetModel {
   defaults(): Backbone.ObjectHash {
@@ -12,8 +22,56 @@ export class OutputModel extends DOMWidgetModel {
       _view_module: '@jupyter-widgets/output',
       _model_module_version: OUTPUT_WIDGET_VERSION,
       _view_module_version: OUTPUT_WIDGET_VERSION,
+      max_outputs: null,
+      max_bytes: null,
     };
   }
+
+  /**
+   * Whether max_outputs or max_bytes bounds the outputs.
+   */
+  isBounded(): boolean {
+    return this.get('max_outputs') !== null || this.get('max_bytes') !== null;
+  }
+
+  /**
+   * Start tracking the sizes of the outputs, when they are all set at once.
+   */
+  resetBounds(outputs: unknown[]): void {
+    this._outputSizes = outputs.map(outputSize);
+    this._outputBytes = this._outputSizes.reduce((a, b) => a + b, 0);
+  }
+
+  /**
+   * Track an appended output, and return how many of the oldest outputs
+   * have to be dropped to keep within max_outputs and max_bytes, counting
+   * the outputs like the kernel does. The newest output is always kept.
+   */
+  appendBounded(output: unknown): number {
+    if (!this._outputSizes) {
+      this.resetBounds([]);
+    }
+    const sizes = this._outputSizes;
+    const size = outputSize(output);
+    sizes.push(size);
+    this._outputBytes += size;
+    const maxOutputs = this.get('max_outputs');
+    const maxBytes = this.get('max_bytes');
+    let count = 0;
+    while (
+      sizes.length - count > 1 &&
+      ((maxOutputs !== null && sizes.length - count > maxOutputs) ||
+        (maxBytes !== null && this._outputBytes > maxBytes))
+    ) {
+      this._outputBytes -= sizes[count];
+      count++;
+    }
+    sizes.splice(0, count);
+    return count;
+  }
+
+  private _outputSizes: number[];
+  private _outputBytes: number;
 }
 
 export class OutputView extends DOMWidgetView {}
@@ -27,6 +27,8 @@ from traitlets import link, dlink
 from IPython import get_ipython
 
 from .widgets import *
+from .persistence import snapshot, restore
+from .memory import memory_report
 
 
 def load_ipython_extension(ip):
@@ -1,5 +1,7 @@
 # compatibility shim for ipykernel < 6.18
+import json
 import sys
+import uuid
 from IPython import get_ipython
 import comm
 
@@ -31,3 +33,144 @@ def create_comm(*args, **kwargs):
         return Comm(*args, **kwargs)
     else:
         return comm.create_comm(*args, **kwargs)
+
+
+class FanOutComm:
+    """A comm publishing a single widget model to many subscriber channels.
+
+    Channels are comm-like objects with ``send``, ``on_msg`` and ``close``
+    methods, e.g. one comm per connected frontend. Every outgoing message is
+    sent to all channels, sharing its buffers. Channels providing a
+    ``send_encoded(payload, metadata=None, buffers=None)`` method receive the
+    JSON encoded message data, computed once for all of them.
+
+    Note that the comms of ipykernel and of the ``comm`` package have no such
+    method: they wrap the data in a message of their own, with their own
+    comm id, and serialize it in ``send``. With these channels the message
+    data is still serialized once per channel, so fanning a widget out to N
+    frontends costs N serializations of each update.
+
+    Incoming messages from all channels are handled in arrival order, so the
+    last update received wins. When the widget does not echo updates back
+    (``JUPYTER_WIDGETS_ECHO`` is off), updates are forwarded to the other
+    channels to keep all frontends in sync.
+
+    Use `fan_out` to make an existing widget publish through a FanOutComm.
+    """
+
+    def __init__(self, comm_id=None, channels=(), initial_message=None):
+        """
+        Parameters
+        ----------
+        comm_id: str or None
+            The comm (model) id. A new id is generated when None.
+        channels: iterable of comms
+            The initial subscriber channels.
+        initial_message: callable or None
+            Called without arguments when a channel subscribes. It returns
+            a ``(data, buffers)`` tuple that is sent to the new channel only,
+            e.g. the current widget state.
+        """
+        self.comm_id = comm_id if comm_id is not None else uuid.uuid4().hex
+        self.initial_message = initial_message
+        self._channels = []
+        self._msg_callback = None
+        for channel in channels:
+            self.subscribe(channel)
+
+    @property
+    def channels(self):
+        """The current subscriber channels."""
+        return tuple(self._channels)
+
+    def subscribe(self, channel):
+        """Add a subscriber channel."""
+        if channel in self._channels:
+            return
+        self._channels.append(channel)
+        channel.on_msg(lambda msg: self._handle_msg(channel, msg))
+        if self.initial_message is not None:
+            data, buffers = self.initial_message()
+            self._publish([channel], data, None, buffers)
+
+    def unsubscribe(self, channel, close=False):
+        """Remove a subscriber channel, optionally closing it."""
+        if channel in self._channels:
+            self._channels.remove(channel)
+            channel.on_msg(None)
+            if close:
+                channel.close()
+
+    def on_msg(self, callback):
+        """Register the callback handling the messages of all channels."""
+        self._msg_callback = callback
+
+    def send(self, data=None, metadata=None, buffers=None):
+        """Send a message to all channels."""
+        self._publish(self._channels, data, metadata, buffers)
+
+    def close(self, data=None, metadata=None, buffers=None, deleting=False):
+        """Close all channels."""
+        channels, self._channels = self._channels, []
+        for channel in channels:
+            channel.close(data=data, metadata=metadata, buffers=buffers)
+
+    def _publish(self, channels, data, metadata, buffers):
+        # only send_encoded channels share the encoded payload, the others
+        # serialize the data themselves in send
+        buffers = [memoryview(b) for b in buffers] if buffers else []
+        payload = None
+        for channel in tuple(channels):
+            send_encoded = getattr(channel, 'send_encoded', None)
+            if send_encoded is None:
+                channel.send(data=data, metadata=metadata, buffers=buffers)
+                continue
+            if payload is None:
+                payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+            send_encoded(payload, metadata=metadata, buffers=buffers)
+
+    def _handle_msg(self, channel, msg):
+        if self._msg_callback is not None:
+            self._msg_callback(msg)
+        data = msg['content']['data']
+        if data.get('method') == 'update':
+            from .widgets.widget import JUPYTER_WIDGETS_ECHO
+            if not JUPYTER_WIDGETS_ECHO:
+                others = [c for c in self._channels if c is not channel]
+                self._publish(others, data, None, msg.get('buffers'))
+
+
+def fan_out(widget, channels=()):
+    """Make a widget publish to many subscriber channels.
+
+    The current comm of the widget becomes the first channel of a new
+    `FanOutComm`, which replaces it. Channels subscribing later first receive
+    the full widget state.
+
+    Parameters
+    ----------
+    widget: Widget
+        The widget to fan out.
+    channels: iterable of comms
+        Additional subscriber channels.
+
+    Returns
+    -------
+    The FanOutComm of the widget.
+    """
+    if isinstance(widget.comm, FanOutComm):
+        fan = widget.comm
+    else:
+        def initial_message():
+            from .widgets.widget import _remove_buffers
+            state, buffer_paths, buffers = _remove_buffers(widget.get_state())
+            return {'method': 'update', 'state': state, 'buffer_paths': buffer_paths}, buffers
+
+        fan = FanOutComm(widget.model_id)
+        if widget.comm is not None:
+            fan.subscribe(widget.comm)
+        fan.initial_message = initial_message
+        widget.comm = fan
+    for channel in channels:
+        fan.subscribe(channel)
+    return fan
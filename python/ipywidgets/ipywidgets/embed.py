@@ -10,10 +10,22 @@
 Functions for generating embeddable HTML/javascript of a widget.
 """
 
+import hashlib
 import json
+import os
 import re
+import uuid
+import weakref
+import zlib
+from concurrent import futures
+from io import StringIO
+from urllib.parse import quote
+from base64 import b64decode, standard_b64encode
+from string import Formatter
 from .widgets import Widget, DOMWidget, widget as widget_module
-from .widgets.widget_link import Link
+from .widgets.widget import (_find_widget_refs, _find_widget_refs_by_state, _remove_buffers,
+                             _state_refs)
+from .widgets.widget_link import _links_within
 from .widgets.docutils import doc_subst
 from ._version import __html_manager_version__
 
@@ -58,6 +70,27 @@ widget_view_template = """<script type="application/vnd.jupyter.widget-view+json
 {view_spec}
 </script>"""
 
+compressed_snippet_template = """
+{load}
+<script type="application/vnd.jupyter.widget-state+json" data-encoding="gzip+base64">
+{json_data}
+</script>
+{widget_views}
+"""
+
+sharded_snippet_template = """
+{load}
+<script type="application/vnd.jupyter.widget-state+json" id="{state_id}"{encoding}>
+{json_data}
+</script>
+{widget_views}
+"""
+
+widget_state_chunk_template = """<script type="application/vnd.jupyter.widget-state-chunk+json" data-jupyter-widgets-state="{state_id}"{encoding}>
+{json_data}
+</script>
+"""
+
 DEFAULT_EMBED_SCRIPT_URL = 'https://cdn.jsdelivr.net/npm/@jupyter-widgets/html-manager@%s/dist/embed.js'%__html_manager_version__
 DEFAULT_EMBED_REQUIREJS_URL = 'https://cdn.jsdelivr.net/npm/@jupyter-widgets/html-manager@%s/dist/embed-amd.js'%__html_manager_version__
 
@@ -89,63 +122,116 @@ _doc_snippets['embed_kwargs'] = """
         If True avoids sending user credentials while requesting the scripts.
         When opening an HTML file from disk, some browsers may refuse to load
         the scripts.
+    {dedupe_buffers}
+    {cache}
+    {compress}
 """
+_doc_snippets['dedupe_buffers'] = """dedupe_buffers: boolean (False)
+        If True, binary buffers are stored once in a table of the manager
+        state, keyed by the SHA-256 hash of their content, and the widget
+        states refer to them by hash. This shrinks exports in which many
+        widgets hold the same binary data."""
+_doc_snippets['cache'] = """cache: boolean (False)
+        If True, the embed state of each widget is cached and only computed
+        again when the widget state changes, which makes repeated exports of
+        mostly unchanged widgets cheaper. In-place changes of trait values are
+        only noticed after `send_state`. The cached states are shared between
+        calls and must not be modified."""
+_doc_snippets['compress'] = """compress: boolean (False)
+        If True, the widget state is gzip-compressed and base64-encoded in
+        the HTML, and marked with a `data-encoding="gzip+base64"` attribute.
+        The HTML manager decompresses it with the browser's
+        `DecompressionStream`."""
+_doc_snippets['embed_kwargs'] = _doc_snippets['embed_kwargs'].format(**_doc_snippets)
+_doc_snippets['sharded'] = """
+    sharded: boolean (False)
+        If True, the models used by a single view are written in a separate
+        state chunk placed before the view, and only the models shared by
+        several views are in the main state block. The HTML manager loads
+        each chunk when its view scrolls into the page, so the first views
+        render without parsing the whole state. When state is None, only the
+        views and their dependencies are included.
+"""
+_doc_snippets['sidecar'] = """
+    sidecar: None, 'files' or 'packed'
+        Where to write the binary buffers of the widget states. By default
+        (None), buffers are base64-encoded inside the HTML. With 'files', each
+        buffer is written to its own `.bin` file in a `<name>_buffers`
+        directory next to the HTML file; with 'packed', all buffers are
+        written to a single `<name>.bin` file next to the HTML file. The
+        state then refers to the buffers by URL, relative to the HTML file,
+        so the page must be served over HTTP for the browser to load them.
+"""
+
+
+# widget -> {cache key: (state version, cached value)}
+_embed_cache = weakref.WeakKeyDictionary()
+
+
+def _cached(widget, key, compute):
+    """Return a value derived from the widget state, computing it again only
+    when the state changed since it was cached"""
+    entries = _embed_cache.setdefault(widget, {})
+    version = widget._state_version
+    entry = entries.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    value = compute()
+    entries[key] = (version, value)
+    return value
+
+
+def _get_embed_state(widget, drop_defaults, cache=False):
+    if not cache:
+        return widget._get_embed_state(drop_defaults=drop_defaults)
+    return _cached(widget, ('state', drop_defaults),
+                   lambda: widget._get_embed_state(drop_defaults=drop_defaults))
 
 
-def _find_widget_refs_by_state(widget, state):
-    """Find references to other widgets in a widget's state"""
-    # Copy keys to allow changes to state during iteration:
-    keys = tuple(state.keys())
-    for key in keys:
-        value = getattr(widget, key)
-        # Trivial case: Direct references to other widgets:
-        if isinstance(value, Widget):
-            yield value
-        # Also check for buried references in known, JSON-able structures
-        # Note: This might miss references buried in more esoteric structures
-        elif isinstance(value, (list, tuple)):
-            for item in value:
-                if isinstance(item, Widget):
-                    yield item
-        elif isinstance(value, dict):
-            for item in value.values():
-                if isinstance(item, Widget):
-                    yield item
-
-
-def _get_recursive_state(widget, store=None, drop_defaults=False):
+def _get_recursive_state(widget, store=None, drop_defaults=False, cache=False):
     """Gets the embed state of a widget, and all other widgets it refers to as well"""
     if store is None:
         store = dict()
-    state = widget._get_embed_state(drop_defaults=drop_defaults)
-    store[widget.model_id] = state
-
-    # Loop over all values included in state (i.e. don't consider excluded values):
-    for ref in _find_widget_refs_by_state(widget, state['state']):
-        if ref.model_id not in store:
-            _get_recursive_state(ref, store, drop_defaults=drop_defaults)
+    stack = [widget]
+    while stack:
+        widget = stack.pop()
+        if widget.model_id in store:
+            continue
+        state = _get_embed_state(widget, drop_defaults, cache)
+        store[widget.model_id] = state
+        # Only consider the values included in state (i.e. not excluded values):
+        refs = [ref for ref in _find_widget_refs(widget, state['state'])
+                if ref.model_id not in store]
+        stack.extend(reversed(refs))
     return store
 
 
-def add_resolved_links(store, drop_defaults):
+def add_resolved_links(store, drop_defaults, cache=False):
     """Adds the state of any link models between two models in store"""
-    for widget_id, widget in widget_module._instances.items(): # go over all widgets
-        if isinstance(widget, Link) and widget_id not in store:
-            if widget.source[0].model_id in store and widget.target[0].model_id in store:
-                store[widget.model_id] = widget._get_embed_state(drop_defaults=drop_defaults)
+    for link in _links_within(store):
+        if link.model_id not in store:
+            store[link.model_id] = _get_embed_state(link, drop_defaults, cache)
+
 
+def _get_all_states(drop_defaults, cache=False):
+    """Get the embed state of all widgets known to the widget manager"""
+    if not cache:
+        return Widget.get_manager_state(drop_defaults=drop_defaults, widgets=None)['state']
+    return {model_id: _get_embed_state(widget, drop_defaults, True)
+            for model_id, widget in list(widget_module._instances.items())}
 
-def dependency_state(widgets, drop_defaults=True):
+
+@doc_subst(_doc_snippets)
+def dependency_state(widgets, drop_defaults=True, cache=False):
     """Get the state of all widgets specified, and their dependencies.
 
     This uses a simple dependency finder, including:
-     - any widget directly referenced in the state of an included widget
-     - any widget in a list/tuple attribute in the state of an included widget
-     - any widget in a dict attribute in the state of an included widget
+     - any widget referenced in the state of an included widget, directly
+       or at any depth of nested list/tuple/dict attributes
      - any jslink/jsdlink between two included widgets
-    What this alogorithm does not do:
-     - Find widget references in nested list/dict structures
-     - Find widget references in other types of attributes
+    What this algorithm does not do:
+     - Find widget references in attributes not serialized with
+       `widget_serialization`
 
     Note that this searches the state of the widgets for references, so if
     a widget reference is not included in the serialized state, it won't
@@ -158,6 +244,7 @@ def dependency_state(widgets, drop_defaults=True):
        and of all their dependencies.
     drop_defaults: boolean
         Whether to drop default values from the widget states.
+    {cache}
 
     Returns
     -------
@@ -167,7 +254,7 @@ def dependency_state(widgets, drop_defaults=True):
     # collect the state of all relevant widgets
     if widgets is None:
         # Get state of all widgets, no smart resolution needed.
-        state = Widget.get_manager_state(drop_defaults=drop_defaults, widgets=None)['state']
+        state = _get_all_states(drop_defaults, cache)
     else:
         try:
             widgets[0]
@@ -175,14 +262,83 @@ def dependency_state(widgets, drop_defaults=True):
             widgets = [widgets]
         state = {}
         for widget in widgets:
-            _get_recursive_state(widget, state, drop_defaults)
+            _get_recursive_state(widget, state, drop_defaults, cache)
         # Add any links between included widgets:
-        add_resolved_links(state, drop_defaults)
+        add_resolved_links(state, drop_defaults, cache)
     return state
 
 
+def _state_closure(model_ids, get_state):
+    """Return the given model ids and the ids of all the models they depend on.
+
+    The dependencies are found from the references in the serialized states,
+    given by get_state(model_id), which returns None for unknown models. Any
+    link between two of the models is included as well.
+    """
+    closure = []
+    stack = list(reversed(model_ids))
+    seen = set()
+    while stack:
+        model_id = stack.pop()
+        if model_id in seen:
+            continue
+        state = get_state(model_id)
+        if state is None:
+            continue
+        seen.add(model_id)
+        closure.append(model_id)
+        stack.extend(reversed(list(_state_refs(state['state']))))
+    # Add any links between the dependencies:
+    for link in _links_within(seen):
+        if link.model_id not in seen and get_state(link.model_id) is not None:
+            seen.add(link.model_id)
+            closure.append(link.model_id)
+    return closure
+
+
+def _shard_state(views, drop_defaults=True, state=None, cache=False):
+    """Split the state needed by views in shared models and per-view chunks.
+
+    The dependencies of each view are found from the references in the
+    serialized states. When state is given, the models are taken from it,
+    and the models it holds that no view depends on are shared.
+
+    Returns (shared, chunks), where shared is the state of the models used by
+    several views, and chunks holds, for each view, the state of the models
+    only used by that view. Links between the models of different views are
+    shared, together with the models they connect, which must all exist when
+    the link is created.
+    """
+    states = {} if state is None else state
+    instances = widget_module._instances
+
+    def get_state(model_id):
+        if model_id not in states and state is None and model_id in instances:
+            states[model_id] = _get_embed_state(instances[model_id], drop_defaults, cache)
+        return states.get(model_id)
+
+    closures = []
+    users = {}
+    for view in views:
+        closure = _state_closure([view.model_id], get_state)
+        closures.append(closure)
+        for model_id in closure:
+            users[model_id] = users.get(model_id, 0) + 1
+
+    linked = set()
+    for link in _links_within(set(users)):
+        if link.model_id not in users:
+            linked.update(_state_closure([link.model_id], get_state))
+
+    shared = {model_id: states[model_id] for model_id in states
+              if users.get(model_id, 0) != 1 or model_id in linked}
+    chunks = [{model_id: states[model_id] for model_id in closure if model_id not in shared}
+              for closure in closures]
+    return shared, chunks
+
+
 @doc_subst(_doc_snippets)
-def embed_data(views, drop_defaults=True, state=None):
+def embed_data(views, drop_defaults=True, state=None, dedupe_buffers=False, cache=False):
     """Gets data for embedding.
 
     Use this to get the raw data for embedding if you have special
@@ -199,6 +355,8 @@ def embed_data(views, drop_defaults=True, state=None):
         passed state directly. This allows for end users to include a
         smaller state, under the responsibility that this state is
         sufficient to reconstruct the embedded views.
+    {dedupe_buffers}
+    {cache}
 
     Returns
     -------
@@ -216,12 +374,16 @@ def embed_data(views, drop_defaults=True, state=None):
 
     if state is None:
         # Get state of all known widgets
-        state = Widget.get_manager_state(drop_defaults=drop_defaults, widgets=None)['state']
+        state = _get_all_states(drop_defaults, cache)
 
     # Rely on ipywidget to get the default values
     json_data = Widget.get_manager_state(widgets=[])
     # but plug in our own state
     json_data['state'] = state
+    if dedupe_buffers:
+        json_data['state'], table = _share_buffers(state)
+        if table:
+            json_data['buffers'] = table
 
     view_specs = [w.get_view_spec() for w in views]
 
@@ -240,6 +402,373 @@ def escape_script(s):
     """
     return script_escape_re.sub(r'\\u003c\1', s)
 
+# Size of the binary chunks that are base64-encoded at once when streaming;
+# a multiple of 3 so that the encoded chunks can simply be concatenated.
+_BASE64_CHUNK_SIZE = 3 * 2**16
+
+
+def _get_embed_state_parts(widget, drop_defaults):
+    """Return the embed state of a widget without encoding its buffers.
+
+    Returns (state, buffers), where the buffers are the raw binary buffers
+    for the entries of state['buffers'], whose 'data' is left as None.
+    """
+    state = {
+        'model_name': widget._model_name,
+        'model_module': widget._model_module,
+        'model_module_version': widget._model_module_version
+    }
+    model_state, buffer_paths, buffers = _remove_buffers(widget.get_state(drop_defaults=drop_defaults))
+    state['state'] = model_state
+    if len(buffers) > 0:
+        state['buffers'] = [{'encoding': 'base64', 'path': p, 'data': None}
+                            for p in buffer_paths]
+    return state, buffers
+
+
+def _iter_model_states(state, drop_defaults, cache=False):
+    """Yield (model_id, model_state, raw buffers) for the models to embed.
+
+    When state is None, the state of every widget is computed one widget at
+    a time, as it is written out.
+    """
+    if state is None and cache:
+        state = _get_all_states(drop_defaults, cache)
+    if state is not None:
+        for model_id, model_state in state.items():
+            yield model_id, model_state, []
+    else:
+        for model_id, widget in list(widget_module._instances.items()):
+            model_state, buffers = _get_embed_state_parts(widget, drop_defaults)
+            yield model_id, model_state, buffers
+
+
+def _write_base64(fp, buffer):
+    data = memoryview(buffer).cast('B')
+    for i in range(0, len(data), _BASE64_CHUNK_SIZE):
+        fp.write(standard_b64encode(data[i:i + _BASE64_CHUNK_SIZE]).decode('ascii'))
+
+
+class _SidecarWriter:
+    """Write embedded buffers to binary files next to an HTML file.
+
+    In 'files' mode, each buffer gets its own file in a `<name>_buffers`
+    directory; in 'packed' mode, all buffers are appended to a single
+    `<name>.bin` file and referred to by offset and length.
+    """
+
+    def __init__(self, html_path, mode):
+        if mode not in ('files', 'packed'):
+            raise ValueError("sidecar must be None, 'files' or 'packed', not %r" % (mode,))
+        self.mode = mode
+        self.directory, name = os.path.split(os.path.abspath(html_path))
+        self.stem = os.path.splitext(name)[0]
+        self._packed = None
+        self._offset = 0
+
+    def add(self, name, buffer):
+        """Write a buffer and return the buffer spec entries referring to it"""
+        data = memoryview(buffer).cast('B')
+        if self.mode == 'files':
+            dirname = self.stem + '_buffers'
+            filename = name + '.bin'
+            os.makedirs(os.path.join(self.directory, dirname), exist_ok=True)
+            with open(os.path.join(self.directory, dirname, filename), 'wb') as f:
+                f.write(data)
+            return {'encoding': 'url', 'data': quote(dirname + '/' + filename)}
+        if self._packed is None:
+            self._packed = open(os.path.join(self.directory, self.stem + '.bin'), 'wb')
+        self._packed.write(data)
+        spec = {'encoding': 'url', 'data': quote(self.stem + '.bin'),
+                'offset': self._offset, 'length': data.nbytes}
+        self._offset += data.nbytes
+        return spec
+
+    def close(self):
+        if self._packed is not None:
+            self._packed.close()
+            self._packed = None
+
+
+_decoders = {'base64': b64decode, 'hex': bytes.fromhex}
+
+
+def _buffer_digest(buffer):
+    return hashlib.sha256(memoryview(buffer).cast('B')).hexdigest()
+
+
+def _share_buffers(state):
+    """Move the buffers of model states to a table keyed by their content hash.
+
+    Returns (state, table), where the buffer entries of the new state refer
+    to the table entries with the 'shared' encoding.
+    """
+    table = {}
+    shared_state = {}
+    for model_id, model_state in state.items():
+        if 'buffers' not in model_state:
+            shared_state[model_id] = model_state
+            continue
+        specs = []
+        for spec in model_state['buffers']:
+            if spec['encoding'] not in _decoders:
+                specs.append(spec)
+                continue
+            digest = _buffer_digest(_decoders[spec['encoding']](spec['data']))
+            table.setdefault(digest, {'encoding': spec['encoding'], 'data': spec['data']})
+            specs.append({'encoding': 'shared', 'path': spec['path'], 'data': digest})
+        shared_state[model_id] = dict(model_state, buffers=specs)
+    return shared_state, table
+
+
+def _write_json(fp, obj, buffers, indent, newline):
+    """Write obj as JSON, with the base64 data of buffers[i] in place of the string '\0buffer-<i>'."""
+    text = json.dumps(obj, indent=indent).replace('\n', newline)
+    for i, buffer in enumerate(buffers):
+        before, text = text.split(json.dumps('\0buffer-%d' % i), 1)
+        fp.write(escape_script(before))
+        fp.write('"')
+        _write_base64(fp, buffer)
+        fp.write('"')
+    fp.write(escape_script(text))
+
+
+def _write_model_state(fp, model_id, model_state, buffers, indent, newline,
+                       sidecar=None, shared=None):
+    """Write the JSON of a model state, streaming its raw buffers as base64.
+
+    If a sidecar writer is given, the buffers are written to it instead, and
+    the state refers to them by URL. If a shared buffer table is given, the
+    buffers are added to it, keyed by content hash, and the state refers to
+    them by hash.
+    """
+    if 'buffers' not in model_state:
+        _write_json(fp, model_state, [], indent, newline)
+        return
+    specs = []
+    raw = []
+    for i, spec in enumerate(model_state['buffers']):
+        if spec['data'] is None:
+            buffer = buffers[i]
+        elif (sidecar is not None or shared is not None) and spec['encoding'] in _decoders:
+            buffer = _decoders[spec['encoding']](spec['data'])
+        else:
+            # already encoded, or stored externally
+            specs.append(spec)
+            continue
+        if shared is not None:
+            digest = _buffer_digest(buffer)
+            shared.setdefault(digest, buffer)
+            specs.append(dict(spec, encoding='shared', data=digest))
+        elif sidecar is not None:
+            specs.append(dict(spec, **sidecar.add('%s-%d' % (model_id, i), buffer)))
+        else:
+            specs.append(dict(spec, data='\0buffer-%d' % len(raw)))
+            raw.append(buffer)
+    _write_json(fp, dict(model_state, buffers=specs), raw, indent, newline)
+
+
+def _cached_model_json(model_id, model_state, indent):
+    """Return the escaped JSON of a model state, if it is a cached embed state.
+
+    The JSON is cached along with the state, and computed again only when the
+    widget state changes. Returns None for states that are not cached.
+    """
+    widget = widget_module._instances.get(model_id)
+    if widget is None or widget not in _embed_cache:
+        return None
+    entries = _embed_cache[widget]
+    for drop_defaults in (True, False):
+        entry = entries.get(('state', drop_defaults))
+        if entry is not None and entry[0] == widget._state_version and entry[1] is model_state:
+            return _cached(widget, ('json', drop_defaults, indent),
+                           lambda: escape_script(json.dumps(model_state, indent=indent)))
+    return None
+
+
+def _write_manager_state(fp, models, indent, sidecar=None, dedupe_buffers=False, cache=False):
+    """Write the widget manager state JSON one model at a time.
+
+    The output is the same as `json.dumps(manager_state, indent=indent)`,
+    with `escape_script` applied. If cache is True, the JSON of cached embed
+    states is reused from previous exports.
+    """
+    if isinstance(indent, int):
+        indent = ' ' * indent
+    if indent is None:
+        newline, item_separator = '', ', '
+    else:
+        newline, item_separator = '\n', ','
+    shared = {} if dedupe_buffers else None
+    header = json.dumps(Widget.get_manager_state(widgets=[]), indent=indent)
+    # the header ends with the empty state dict: '{}' followed by the closing of the manager state
+    head, tail = header.rsplit('{}', 1)
+    fp.write(head)
+    fp.write('{')
+    level = newline + (indent or '') * 2
+    first = True
+    for model_id, model_state, buffers in models:
+        if not first:
+            fp.write(item_separator)
+        first = False
+        fp.write(level)
+        fp.write(escape_script(json.dumps(model_id)))
+        fp.write(': ')
+        text = None
+        if cache and sidecar is None and shared is None:
+            text = _cached_model_json(model_id, model_state, indent)
+        if text is not None:
+            fp.write(text.replace('\n', level))
+        else:
+            _write_model_state(fp, model_id, model_state, buffers, indent, level, sidecar, shared)
+    if not first:
+        fp.write(newline + (indent or ''))
+    fp.write('}')
+    if shared:
+        # the shared buffer table comes after the state
+        table = {}
+        raw = []
+        for digest, buffer in shared.items():
+            if sidecar is not None:
+                table[digest] = sidecar.add(digest, buffer)
+            else:
+                table[digest] = {'encoding': 'base64', 'data': '\0buffer-%d' % len(raw)}
+                raw.append(buffer)
+        fp.write(item_separator + newline + (indent or '') + '"buffers": ')
+        _write_json(fp, table, raw, indent, newline + (indent or ''))
+    fp.write(tail)
+
+
+class _GzipBase64Writer:
+    """A text file-like object that gzip-compresses and base64-encodes to fp.
+
+    Call close() to write the end of the compressed data.
+    """
+
+    def __init__(self, fp):
+        self._fp = fp
+        self._compressor = zlib.compressobj(wbits=31)
+        self._pending = b''
+
+    def write(self, s):
+        self._emit(self._compressor.compress(s.encode('utf-8')))
+
+    def _emit(self, data, final=False):
+        data = self._pending + data
+        # only encode multiples of 3 bytes, so that the base64 parts can be concatenated
+        n = len(data) if final else len(data) - len(data) % 3
+        if n:
+            self._fp.write(standard_b64encode(data[:n]).decode('ascii'))
+        self._pending = data[n:]
+
+    def close(self):
+        self._emit(self._compressor.flush(), final=True)
+
+
+def _compressed(write):
+    """Wrap a writer function to write gzip-compressed, base64-encoded data"""
+    def write_compressed(fp):
+        f = _GzipBase64Writer(fp)
+        write(f)
+        f.close()
+    return write_compressed
+
+
+def _write_template(fp, template, values):
+    """Write a format string to a file.
+
+    The values are strings, or callables writing the value to fp.
+    """
+    for literal, field, spec, conversion in Formatter().parse(template):
+        fp.write(literal)
+        if field is None:
+            continue
+        value = values[field]
+        if callable(value):
+            value(fp)
+        else:
+            if conversion is not None:
+                value = {'r': repr, 's': str, 'a': ascii}[conversion](value)
+            fp.write(format(value, spec))
+
+
+def _load_snippet(embed_url, requirejs, cors):
+    """Return the HTML loading the widget manager"""
+    if embed_url is None:
+        embed_url = DEFAULT_EMBED_REQUIREJS_URL if requirejs else DEFAULT_EMBED_SCRIPT_URL
+
+    load = load_requirejs_template if requirejs else load_template
+
+    use_cors = ' crossorigin="anonymous"' if cors else ''
+
+    return load.format(embed_url=embed_url, use_cors=use_cors)
+
+
+def _write_view_specs(fp, view_specs):
+    for i, view_spec in enumerate(view_specs):
+        if i:
+            fp.write('\n')
+        fp.write(widget_view_template.format(view_spec=escape_script(json.dumps(view_spec))))
+
+
+def _write_snippet(fp, views, drop_defaults=True, state=None, indent=2,
+                   embed_url=None, requirejs=True, cors=True, dedupe_buffers=False,
+                   cache=False, sharded=False, compress=False, sidecar=None):
+    """Write the HTML snippet of embed_snippet to fp, without building it in memory."""
+    if views is None:
+        views = [w for w in widget_module._instances.values() if isinstance(w, DOMWidget)]
+    else:
+        try:
+            views[0]
+        except (IndexError, TypeError):
+            views = [views]
+
+    load = _load_snippet(embed_url, requirejs, cors)
+
+    if not sharded:
+        def write_json_data(fp):
+            _write_manager_state(fp, _iter_model_states(state, drop_defaults, cache), indent,
+                                 sidecar, dedupe_buffers, cache)
+
+        _write_template(fp, compressed_snippet_template if compress else snippet_template, {
+            'load': load,
+            'json_data': _compressed(write_json_data) if compress else write_json_data,
+            'widget_views': lambda fp: _write_view_specs(fp, [v.get_view_spec() for v in views]),
+        })
+        return
+
+    shared, chunks = _shard_state(views, drop_defaults, state, cache)
+    state_id = 'widget-state-' + uuid.uuid4().hex
+    encoding = ' data-encoding="gzip+base64"' if compress else ''
+
+    def write_state(model_states):
+        write = lambda fp: _write_manager_state(
+            fp, _iter_model_states(model_states, drop_defaults, cache), indent,
+            sidecar, dedupe_buffers, cache)
+        return _compressed(write) if compress else write
+
+    def write_widget_views(fp):
+        for i, (view, chunk) in enumerate(zip(views, chunks)):
+            if i:
+                fp.write('\n')
+            if chunk:
+                _write_template(fp, widget_state_chunk_template, {
+                    'state_id': state_id,
+                    'encoding': encoding,
+                    'json_data': write_state(chunk),
+                })
+            fp.write(widget_view_template.format(
+                view_spec=escape_script(json.dumps(view.get_view_spec()))))
+
+    _write_template(fp, sharded_snippet_template, {
+        'load': load,
+        'state_id': state_id,
+        'encoding': encoding,
+        'json_data': write_state(shared),
+        'widget_views': write_widget_views,
+    })
+
+
 @doc_subst(_doc_snippets)
 def embed_snippet(views,
                   drop_defaults=True,
@@ -247,7 +776,11 @@ def embed_snippet(views,
                   indent=2,
                   embed_url=None,
                   requirejs=True,
-                  cors=True
+                  cors=True,
+                  dedupe_buffers=False,
+                  cache=False,
+                  sharded=False,
+                  compress=False
                  ):
     """Return a snippet that can be embedded in an HTML file.
 
@@ -255,36 +788,23 @@ def embed_snippet(views,
     ----------
     {views_attribute}
     {embed_kwargs}
+    {sharded}
 
     Returns
     -------
     A unicode string with an HTML snippet containing several `<script>` tags.
     """
 
-    data = embed_data(views, drop_defaults=drop_defaults, state=state)
-
-    widget_views = '\n'.join(
-        widget_view_template.format(view_spec=escape_script(json.dumps(view_spec)))
-        for view_spec in data['view_specs']
-    )
-
-    if embed_url is None:
-        embed_url = DEFAULT_EMBED_REQUIREJS_URL if requirejs else DEFAULT_EMBED_SCRIPT_URL
-
-    load = load_requirejs_template if requirejs else load_template
-
-    use_cors = ' crossorigin="anonymous"' if cors else ''
-    values = {
-        'load': load.format(embed_url=embed_url, use_cors=use_cors),
-        'json_data': escape_script(json.dumps(data['manager_state'], indent=indent)),
-        'widget_views': widget_views,
-    }
-
-    return snippet_template.format(**values)
+    f = StringIO()
+    _write_snippet(f, views, drop_defaults=drop_defaults, state=state, indent=indent,
+                   embed_url=embed_url, requirejs=requirejs, cors=cors,
+                   dedupe_buffers=dedupe_buffers, cache=cache, sharded=sharded,
+                   compress=compress)
+    return f.getvalue()
 
 
 @doc_subst(_doc_snippets)
-def embed_minimal_html(fp, views, title='IPyWidget export', template=None, **kwargs):
+def embed_minimal_html(fp, views, title='IPyWidget export', template=None, sidecar=None, **kwargs):
     """Write a minimal HTML file with widget views embedded.
 
     Parameters
@@ -298,22 +818,173 @@ def embed_minimal_html(fp, views, title='IPyWidget export', template=None, **kwa
         `{{title}}` and `{{snippet}}`. The `{{snippet}}` placeholder
         will be replaced by all the widgets.
     {embed_kwargs}
-    """
-    snippet = embed_snippet(views, **kwargs)
+    {sharded}
+    {sidecar}
 
+    The HTML is written to the file as it is generated, one widget at a
+    time, so that large states are never held in memory as a whole.
+    """
+    writer = None
+    if sidecar is not None:
+        writer = _SidecarWriter(_html_path(fp), sidecar)
     values = {
         'title': title,
-        'snippet': snippet,
+        'snippet': lambda f: _write_snippet(f, views, sidecar=writer, **kwargs),
     }
     if template is None:
         template = html_template
 
-    html_code = template.format(**values)
+    try:
+        # Check if fp is writable:
+        if hasattr(fp, 'write'):
+            _write_template(fp, template, values)
+        else:
+            # Assume fp is a filename:
+            with open(fp, "w") as f:
+                _write_template(f, template, values)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _html_path(fp):
+    """Return the path of the HTML file written to fp, for the sidecar files"""
+    path = getattr(fp, 'name', None) if hasattr(fp, 'write') else fp
+    if not isinstance(path, (str, os.PathLike)):
+        raise ValueError('sidecar buffers need the path of the HTML file, '
+                         'pass a filename or a file object with a name')
+    return path
+
+
+def _write_export(fp, title, template, load, models, view_specs, indent,
+                  dedupe_buffers=False, sidecar=None, compress=False):
+    """Write an HTML export from serialized models and view specs.
+
+    This only uses plain data, so that it can run in a worker process.
+    """
+    writer = None if sidecar is None else _SidecarWriter(_html_path(fp), sidecar)
+
+    def write_json_data(f):
+        _write_manager_state(f, models, indent, writer, dedupe_buffers)
+
+    def write_snippet(f):
+        _write_template(f, compressed_snippet_template if compress else snippet_template, {
+            'load': load,
+            'json_data': _compressed(write_json_data) if compress else write_json_data,
+            'widget_views': lambda f: _write_view_specs(f, view_specs),
+        })
+
+    values = {'title': title, 'snippet': write_snippet}
+    try:
+        if hasattr(fp, 'write'):
+            _write_template(fp, template, values)
+        else:
+            with open(fp, "w") as f:
+                _write_template(f, template, values)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+@doc_subst(_doc_snippets)
+def embed_minimal_html_batch(jobs, title='IPyWidget export', template=None,
+                             drop_defaults=True, indent=2, embed_url=None,
+                             requirejs=True, cors=True, dedupe_buffers=False,
+                             sidecar=None, compress=False, executor=None, max_workers=None):
+    """Write many minimal HTML files with widget views embedded.
+
+    Each file holds its views and their dependencies, as with
+    `dependency_state`. The state of every widget is computed once in the
+    calling thread, even when it is used by several files. The JSON and
+    base64 encoding and the writing of the files run in a pool of workers.
 
-    # Check if fp is writable:
-    if hasattr(fp, 'write'):
-        fp.write(html_code)
+    Parameters
+    ----------
+    jobs: iterable of (views, fp) or (views, fp, title) tuples
+        views: widget or collection of widgets to include views for
+        fp: filename or file-like object to write the HTML output to
+        title: title of the html page, overriding the `title` argument
+    title: default title of the html pages.
+    template: Template in which to embed the widget state.
+        See `embed_minimal_html`.
+    drop_defaults: boolean
+        Whether to drop default values from the widget states.
+    indent: integer, string or None
+        The indent to use for the JSON state dump. See `json.dumps` for
+        full description.
+    embed_url: string or None
+        Allows for overriding the URL used to fetch the widget manager
+        for the embedded code. This defaults (None) to a `jsDelivr` CDN url.
+    requirejs: boolean (True)
+        Enables the requirejs-based embedding, which allows for custom widgets.
+        If True, the embed_url should point to an AMD module.
+    cors: boolean (True)
+        If True avoids sending user credentials while requesting the scripts.
+    {dedupe_buffers}
+    {sidecar}
+    {compress}
+    executor: 'thread', 'process', concurrent.futures.Executor or None
+        Where to encode and write the files: a thread pool, a process pool
+        (fp must then be a filename), or the given executor. The pools are
+        created for the call and have at most `max_workers` workers. The
+        encoding is pure Python and holds the GIL, so only a process pool
+        uses several cores; a thread pool only overlaps the file writes. The
+        default (None) uses a process pool when every fp is a filename, and
+        a thread pool otherwise.
+    max_workers: integer or None
+        The number of workers of the created pool.
+    """
+    if template is None:
+        template = html_template
+    load = _load_snippet(embed_url, requirejs, cors)
+    jobs = list(jobs)
+    if executor is None:
+        paths = all(isinstance(job[1], (str, os.PathLike)) for job in jobs)
+        executor = 'process' if paths else 'thread'
+    # buffers are sent to the workers of any process pool, given or created
+    in_process = executor == 'process' or isinstance(executor, futures.ProcessPoolExecutor)
+
+    # model id -> (embed state without buffer data, raw buffers)
+    parts = {}
+    instances = widget_module._instances
+
+    def get_state(model_id):
+        if model_id not in parts:
+            if model_id not in instances:
+                return None
+            model_state, buffers = _get_embed_state_parts(instances[model_id], drop_defaults)
+            if in_process:
+                # memoryviews cannot be sent to other processes
+                buffers = [bytes(b) for b in buffers]
+            parts[model_id] = model_state, buffers
+        return parts[model_id][0]
+
+    tasks = []
+    for job in jobs:
+        views, fp = job[:2]
+        try:
+            views[0]
+        except (IndexError, TypeError):
+            views = [views]
+        closure = _state_closure([view.model_id for view in views], get_state)
+        models = [(model_id,) + parts[model_id] for model_id in closure]
+        view_specs = [view.get_view_spec() for view in views]
+        tasks.append((fp, job[2] if len(job) > 2 else title, template, load,
+                      models, view_specs, indent, dedupe_buffers, sidecar, compress))
+
+    if isinstance(executor, futures.Executor):
+        pool = executor
+    elif executor == 'thread':
+        pool = futures.ThreadPoolExecutor(max_workers)
+    elif executor == 'process':
+        pool = futures.ProcessPoolExecutor(max_workers)
     else:
-        # Assume fp is a filename:
-        with open(fp, "w") as f:
-            f.write(html_code)
+        raise ValueError("executor must be 'thread', 'process' or a "
+                         "concurrent.futures.Executor, not %r" % (executor,))
+    try:
+        results = [pool.submit(_write_export, *task) for task in tasks]
+        for result in results:
+            result.result()
+    finally:
+        if pool is not executor:
+            pool.shutdown()
@@ -0,0 +1,204 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+
+"""
+Memory accounting for the widgets living in the kernel.
+"""
+
+import json
+import weakref
+
+from .widgets import widget as widget_module
+from .widgets.widget import _remove_buffers, _find_widget_refs
+from .widgets.widget_layout import Layout
+from .widgets.widget_style import Style
+
+# widget -> (state version, class name, json bytes, buffer bytes, referenced model ids)
+_sizes = weakref.WeakKeyDictionary()
+
+# widget -> (state version, reachable model ids, total bytes)
+_totals = weakref.WeakKeyDictionary()
+
+# model ids seen by the last report, to notice closed widgets
+_last_ids = set()
+
+
+def _widget_sizes(widget):
+    """Return the cached size entry of a widget, recomputing it if its state changed"""
+    entry = _sizes.get(widget)
+    if entry is not None and entry[0] == widget._state_version:
+        return entry
+    version = widget._state_version
+    state, _, buffers = _remove_buffers(widget.get_state())
+    json_bytes = len(json.dumps(state, separators=(',', ':'), default=str).encode('utf-8'))
+    buffer_bytes = sum(memoryview(b).nbytes for b in buffers)
+    refs = tuple(ref.model_id for ref in _find_widget_refs(widget, widget.keys)
+                 if ref.comm is not None)
+    entry = (version, type(widget).__name__, json_bytes, buffer_bytes, refs)
+    _sizes[widget] = entry
+    return entry
+
+
+def _subtree_totals(instances, entries):
+    """Return the total size of every widget, including the widgets it refers to.
+
+    Totals are cached with the state version of each widget. A widget whose
+    version changed, or which appeared or was closed, invalidates the totals
+    of every widget referring to it, directly or not. The invalidated widgets
+    are then visited once in post-order, strongly connected components
+    (reference cycles) first, reusing the totals of their children.
+    """
+    global _last_ids
+    parents = {}
+    for model_id, entry in entries.items():
+        for ref in entry[4]:
+            parents.setdefault(ref, []).append(model_id)
+
+    dirty = list(_last_ids.symmetric_difference(entries))
+    for model_id, w in instances.items():
+        cached = _totals.get(w)
+        if cached is None or cached[0] != entries[model_id][0]:
+            dirty.append(model_id)
+    _last_ids = set(entries)
+
+    stale = set()
+    while dirty:
+        model_id = dirty.pop()
+        if model_id not in stale:
+            stale.add(model_id)
+            dirty.extend(parents.get(model_id, ()))
+
+    reach = {}
+    totals = {}
+    for model_id, w in instances.items():
+        if model_id not in stale:
+            _, reach[model_id], totals[model_id] = _totals[w]
+
+    # iterative Tarjan, components come out children first
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    for root in stale:
+        if root in index or root not in entries:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(entries[root][4]))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in entries or child in reach:
+                    continue
+                if child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(entries[child][4])))
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    _component_total(component, entries, reach, totals)
+
+    for model_id in stale:
+        if model_id in entries:
+            _totals[instances[model_id]] = (entries[model_id][0], reach[model_id],
+                                            totals[model_id])
+    return totals
+
+
+def _component_total(component, entries, reach, totals):
+    """Compute the reachable set and total of a strongly connected component"""
+    members = set(component)
+    children = {ref for model_id in component for ref in entries[model_id][4]
+                if ref in entries and ref not in members}
+    reachable = members.union(*(reach[child] for child in children))
+    own = sum(entries[m][2] + entries[m][3] for m in members)
+    if len(reachable) == len(members) + sum(len(reach[child]) for child in children):
+        # no widget is shared between the children, their totals add up
+        total = own + sum(totals[child] for child in children)
+    else:
+        total = sum(entries[m][2] + entries[m][3] for m in reachable)
+    reachable = frozenset(reachable)
+    for model_id in component:
+        reach[model_id] = reachable
+        totals[model_id] = total
+
+
+def memory_report(top=10):
+    """Report the size of the state held by the widgets in the kernel.
+
+    The state size of a widget is estimated from its JSON serialization and
+    its binary buffers. Sizes and subtree totals are cached per widget and
+    only recomputed when the state of the widget, or of a widget it refers
+    to, changes, so calling this repeatedly is cheap. Note that
+    in-place mutations of trait values are only noticed after ``send_state``.
+
+    Parameters
+    ----------
+    top: int
+        The number of heaviest widgets to list.
+
+    Returns
+    -------
+    A dictionary with the following entries:
+        widget_count: number of live widgets
+        json_bytes: total size of the JSON state of all widgets
+        buffer_bytes: total size of the binary buffers of all widgets
+        widgets: dict mapping model ids to dicts with the widget class, its own
+            ``json_bytes`` and ``buffer_bytes``, and ``total_bytes``, which
+            includes every widget it refers to, directly or not
+        classes: dict mapping class names to dicts with the ``count``,
+            ``json_bytes`` and ``buffer_bytes`` of the widgets of that class
+        orphans: number of ``Layout`` and ``Style`` widgets not referenced by
+            any other live widget
+        top: list of the ``top`` model ids with the largest ``total_bytes``
+    """
+    instances = dict(widget_module._instances)
+    entries = {model_id: _widget_sizes(w) for model_id, w in instances.items()}
+
+    classes = {}
+    referenced = set()
+    for entry in entries.values():
+        stats = classes.setdefault(entry[1], {'count': 0, 'json_bytes': 0, 'buffer_bytes': 0})
+        stats['count'] += 1
+        stats['json_bytes'] += entry[2]
+        stats['buffer_bytes'] += entry[3]
+        referenced.update(entry[4])
+
+    totals = _subtree_totals(instances, entries)
+    widgets = {model_id: {'class': entry[1], 'json_bytes': entry[2],
+                          'buffer_bytes': entry[3], 'total_bytes': totals[model_id]}
+               for model_id, entry in entries.items()}
+
+    orphans = {'Layout': 0, 'Style': 0}
+    for model_id, w in instances.items():
+        if model_id not in referenced:
+            if isinstance(w, Layout):
+                orphans['Layout'] += 1
+            elif isinstance(w, Style):
+                orphans['Style'] += 1
+
+    return {
+        'widget_count': len(entries),
+        'json_bytes': sum(e[2] for e in entries.values()),
+        'buffer_bytes': sum(e[3] for e in entries.values()),
+        'widgets': widgets,
+        'classes': classes,
+        'orphans': orphans,
+        'top': sorted(widgets, key=lambda m: widgets[m]['total_bytes'], reverse=True)[:top],
+    }
@@ -0,0 +1,197 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+
+"""
+Functions for saving the kernel-side widget state to a file and restoring it,
+e.g. after a kernel restart.
+
+A snapshot file holds a magic string, a format version, a JSON header
+describing every model (registry key, model id, state and the location of its
+binary buffers), followed by the raw binary buffers. Buffers are never
+encoded, so media-heavy widgets restore without base64 overhead.
+"""
+
+import json
+import struct
+
+from .widgets import Widget, widget as widget_module
+from .widgets.widget import _registry, _remove_buffers, _put_buffers, _widget_tree, _state_refs
+
+SNAPSHOT_MAGIC = b'IPYWSNAP'
+SNAPSHOT_VERSION = 1
+
+_header_struct = struct.Struct('<8sIQ')
+
+
+def _registry_key(widget):
+    return [widget._model_module, widget._model_module_version, widget._model_name,
+            widget._view_module, widget._view_module_version, widget._view_name]
+
+
+def snapshot(path, widgets=None):
+    """Save the state of widgets to a binary snapshot file.
+
+    Parameters
+    ----------
+    path: filename or binary file-like object
+        The file to write the snapshot to.
+    widgets: widget or collection of widgets or None
+        The widgets to save, together with all the widgets they refer to. If
+        None, all widgets known to the kernel are saved.
+    """
+    if widgets is None:
+        widgets = list(widget_module._instances.values())
+    else:
+        try:
+            widgets[0]
+        except (IndexError, TypeError):
+            widgets = [widgets]
+        seen = set()
+        tree = []
+        for w in widgets:
+            for ref in _widget_tree(w):
+                if ref.model_id not in seen:
+                    seen.add(ref.model_id)
+                    tree.append(ref)
+        widgets = tree
+
+    models = []
+    all_buffers = []
+    offset = 0
+    for w in widgets:
+        state, buffer_paths, buffers = _remove_buffers(w.get_state(drop_defaults=True))
+        buffer_specs = []
+        for p, b in zip(buffer_paths, buffers):
+            b = memoryview(b).cast('B')
+            buffer_specs.append([p, offset, b.nbytes])
+            all_buffers.append(b)
+            offset += b.nbytes
+        models.append({
+            'model_id': w.model_id,
+            'class': _registry_key(w),
+            'state': state,
+            'buffers': buffer_specs,
+        })
+    header = json.dumps({'models': models}, separators=(',', ':')).encode('utf-8')
+
+    def write(f):
+        f.write(_header_struct.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header)))
+        f.write(header)
+        for b in all_buffers:
+            f.write(b)
+
+    if hasattr(path, 'write'):
+        write(path)
+    else:
+        with open(path, 'wb') as f:
+            write(f)
+
+
+def _read_snapshot(path):
+    if hasattr(path, 'read'):
+        data = path.read()
+    else:
+        with open(path, 'rb') as f:
+            data = f.read()
+    if len(data) < _header_struct.size:
+        raise ValueError('Not a widget snapshot: file too short')
+    magic, version, header_size = _header_struct.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError('Not a widget snapshot: bad magic %r' % magic)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError('Unsupported widget snapshot version %d, expected %d' % (version, SNAPSHOT_VERSION))
+    start = _header_struct.size
+    header = json.loads(data[start:start + header_size].decode('utf-8'))
+    return header['models'], memoryview(data)[start + header_size:]
+
+
+def _restore_order(models):
+    """Order models so that referenced models come before the models using them.
+
+    Models in reference cycles are appended at the end, in file order.
+    """
+    pending = {}
+    dependents = {}
+    for model_id, model in models.items():
+        refs = {ref for ref in _state_refs(model['state'])
+                if ref in models and ref != model_id}
+        pending[model_id] = len(refs)
+        for ref in refs:
+            dependents.setdefault(ref, []).append(model_id)
+    order = [model_id for model_id, count in pending.items() if count == 0]
+    for model_id in order:
+        for dependent in dependents.get(model_id, ()):
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                order.append(dependent)
+    ordered = set(order)
+    order.extend(model_id for model_id in models if model_id not in ordered)
+    return order
+
+
+def restore(path):
+    """Recreate the widgets saved in a snapshot file.
+
+    Every widget is created with its saved model id and its full state, so
+    each model is opened with a single comm message. Only synced state is
+    saved; selection widgets get their labels back as options. Models whose id
+    is already in use by a live widget are not recreated.
+
+    Parameters
+    ----------
+    path: filename or binary file-like object
+        The snapshot file written by `snapshot`.
+
+    Returns
+    -------
+    A dictionary mapping model ids to the restored widgets.
+    """
+    entries, data = _read_snapshot(path)
+    models = {}
+    for entry in entries:
+        state = entry['state']
+        paths = [p for p, _, _ in entry['buffers']]
+        buffers = [data[o:o + n] for _, o, n in entry['buffers']]
+        _put_buffers(state, paths, buffers)
+        models[entry['model_id']] = entry
+
+    instances = widget_module._instances
+    restored = {}
+    deferred = []
+    for model_id in _restore_order(models):
+        if model_id in instances:
+            restored[model_id] = instances[model_id]
+            continue
+        entry = models[model_id]
+        try:
+            klass = _registry.get(*entry['class'])
+        except KeyError:
+            raise ValueError('Cannot restore model %s: no widget class registered for %r'
+                             % (model_id, entry['class']))
+        traits = klass.class_traits()
+        kwargs = {}
+        later = {}
+        state = entry['state']
+        if '_options_labels' in state and 'options' in traits:
+            kwargs['options'] = state['_options_labels']
+        for name, value in state.items():
+            trait = traits.get(name)
+            if trait is None or trait.read_only:
+                continue
+            if any(ref in models and ref not in instances for ref in _state_refs(value)):
+                # reference cycle: set it once the other models exist
+                later[name] = value
+                continue
+            from_json = trait.metadata.get('from_json', Widget._trait_from_json)
+            kwargs[name] = from_json(value, None)
+        widget = klass(model_id=model_id, **kwargs)
+        restored[model_id] = widget
+        if later:
+            deferred.append((widget, later))
+
+    for widget, later in deferred:
+        with widget.hold_sync():
+            for name, value in later.items():
+                from_json = widget.trait_metadata(name, 'from_json', widget._trait_from_json)
+                widget.set_trait(name, from_json(value, widget))
+    return {model_id: restored[model_id] for model_id in models}
@@ -0,0 +1,92 @@
+import json
+from unittest import mock
+
+from ..comm import FanOutComm, fan_out
+from ..widgets import IntSlider, Widget, widget as widget_module
+
+
+class Channel:
+    """A subscriber channel recording what it is sent"""
+
+    def __init__(self):
+        self.messages = []
+        self.closed = False
+        self.callback = None
+
+    def on_msg(self, callback):
+        self.callback = callback
+
+    def send(self, data=None, metadata=None, buffers=None):
+        self.messages.append((data, buffers))
+
+    def close(self, data=None, metadata=None, buffers=None):
+        self.closed = True
+
+    def receive(self, data, buffers=()):
+        self.callback({'content': {'data': data}, 'buffers': list(buffers)})
+
+
+class EncodedChannel(Channel):
+    """A channel accepting pre-encoded messages"""
+
+    def send_encoded(self, payload, metadata=None, buffers=None):
+        self.messages.append((payload, buffers))
+
+
+class TestFanOut:
+
+    def teardown_method(self):
+        Widget.close_all()
+
+    def test_send_to_all_channels(self):
+        a, b = Channel(), Channel()
+        fan = FanOutComm(channels=[a, b])
+        fan.send({'method': 'custom'}, buffers=[b'abc'])
+        assert a.messages == b.messages == [({'method': 'custom'}, [b'abc'])]
+        assert a.messages[0][1][0] is b.messages[0][1][0]
+
+    def test_encode_once(self):
+        a, b = EncodedChannel(), EncodedChannel()
+        fan = FanOutComm(channels=[a, b])
+        with mock.patch('json.dumps', wraps=json.dumps) as dumps:
+            fan.send({'method': 'update', 'state': {'value': 1}})
+        assert dumps.call_count == 1
+        assert a.messages[0][0] is b.messages[0][0]
+        assert json.loads(a.messages[0][0]) == {'method': 'update', 'state': {'value': 1}}
+
+    def test_widget_fan_out(self):
+        slider = IntSlider(1)
+        model_id = slider.model_id
+        viewer = Channel()
+        fan = fan_out(slider, [viewer])
+        assert slider.comm is fan
+        assert slider.model_id == model_id
+        assert widget_module._instances[model_id] is slider
+
+        # new subscribers get the full state
+        data, _ = viewer.messages[0]
+        assert data['method'] == 'update'
+        assert data['state']['value'] == 1
+
+        slider.value = 2
+        data, _ = viewer.messages[-1]
+        assert data == {'method': 'update', 'state': {'value': 2}, 'buffer_paths': []}
+
+        # updates from any subscriber are applied
+        viewer.receive({'method': 'update', 'state': {'value': 3}, 'buffer_paths': []})
+        assert slider.value == 3
+
+        slider.close()
+        assert viewer.closed
+        assert not fan.channels
+
+    def test_forward_updates_without_echo(self):
+        slider = IntSlider(1)
+        a, b = Channel(), Channel()
+        fan_out(slider, [a, b])
+        with mock.patch.object(widget_module, 'JUPYTER_WIDGETS_ECHO', False):
+            a.receive({'method': 'update', 'state': {'value': 5}, 'buffer_paths': []})
+            b.receive({'method': 'update', 'state': {'value': 7}, 'buffer_paths': []})
+        assert slider.value == 7
+        assert a.messages[-1][0]['state'] == {'value': 7}
+        assert b.messages[-1][0]['state'] == {'value': 5}
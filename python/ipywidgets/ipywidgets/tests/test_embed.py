@@ -1,16 +1,25 @@
 
+import base64
+import gzip
 from io import StringIO
 from html.parser import HTMLParser
 import json
 import os
 import re
+import sys
 import tempfile
 import shutil
+from concurrent import futures
+from unittest import mock
+
+import pytest
 
 import traitlets
 
-from ..widgets import IntSlider, IntText, Text, Widget, jslink, HBox, widget_serialization, widget as widget_module
-from ..embed import embed_data, embed_snippet, embed_minimal_html, dependency_state
+from ..widgets import (IntSlider, IntText, Text, Widget, jslink, HBox, Image,
+                       widget_serialization, widget as widget_module)
+from ..embed import (embed_data, embed_snippet, embed_minimal_html, embed_minimal_html_batch,
+                     dependency_state, escape_script)
 
 
 class CaseWidget(Widget):
@@ -135,6 +144,106 @@ class TestEmbed:
         assert len(views) == 1
 
 
+    def test_dependency_state_nested(self):
+        w1 = IntText(4)
+        w2 = IntSlider()
+        w = CaseWidget(other={'nested': [[w1, {'deeper': (w2,)}]]})
+        state = dependency_state(w)
+        for ref in (w, w1, w2, w1.layout, w2.layout, w2.style):
+            assert ref.model_id in state
+
+    def test_find_widget_refs_by_state(self):
+        from ..embed import _find_widget_refs_by_state
+        w1 = IntText(4)
+        w = CaseWidget(a=w1, other={'nested': [w1.layout]})
+        state = w.get_state()
+        refs = list(_find_widget_refs_by_state(w, state))
+        assert refs == [w1, w1.layout] or refs == [w1.layout, w1]
+
+    def test_dependency_state_deep(self):
+        widgets = [CaseWidget()]
+        for _ in range(sys.getrecursionlimit() + 100):
+            widgets.append(CaseWidget(a=widgets[-1]))
+        state = dependency_state(widgets[-1])
+        assert set(state) == {w.model_id for w in widgets}
+        widgets[-1].close(recursive=True)
+
+    def test_dependency_state_cache(self):
+        w = IntSlider()
+        state1 = dependency_state(w, cache=True)
+        state2 = dependency_state(w, cache=True)
+        assert state1[w.model_id] is state2[w.model_id]
+        assert state1[w.layout.model_id] is state2[w.layout.model_id]
+        w.value = 5
+        state3 = dependency_state(w, cache=True)
+        assert state3[w.model_id] is not state1[w.model_id]
+        assert state3[w.model_id]['state']['value'] == 5
+        assert state3[w.layout.model_id] is state1[w.layout.model_id]
+
+    def test_snippet_cache(self):
+        w = IntSlider()
+        image = Image(value=b'abc')
+        views = [w, image]
+        for state in [None, dependency_state(views, cache=True)]:
+            assert embed_snippet(views, state=state, cache=True) == embed_snippet(views, state=state)
+        snippet = embed_snippet(views, cache=True)
+        assert embed_snippet(views, cache=True) == snippet
+        w.value = 7
+        state = dependency_state(views, cache=True)
+        assert embed_snippet(views, state=state, cache=True) == embed_snippet(views, state=state)
+        assert '"value": 7' in embed_snippet(views, state=state, cache=True)
+
+    def test_snippet_sharded(self):
+        s1 = IntSlider()
+        s2 = IntSlider(layout=s1.layout)
+        t = IntText()
+        jslink((s2, 'value'), (t, 'value'))
+        unrelated = IntText()
+        box = HBox(children=[s2, t])
+        snippet = embed_snippet([s1, box], sharded=True)
+
+        state_id = re.search(r'<script type="application/vnd.jupyter.widget-state\+json" id="([^"]+)">',
+                             snippet).group(1)
+        blocks = re.findall(r'<script type="application/vnd.jupyter.widget-state(-chunk)?\+json"'
+                            r'(?: id="[^"]+"| data-jupyter-widgets-state="([^"]+)")>(.*?)</script>\s*'
+                            r'(?:<script type="application/vnd.jupyter.widget-view\+json">(.*?)</script>)?',
+                            snippet, re.DOTALL)
+        shared = json.loads(blocks[0][2])['state']
+        assert set(shared) == {s1.layout.model_id}
+        chunks = {}
+        for chunk, chunk_state_id, data, view in blocks[1:]:
+            assert chunk and chunk_state_id == state_id
+            chunks[json.loads(view)['model_id']] = set(json.loads(data)['state'])
+        assert chunks[s1.model_id] == {s1.model_id, s1.style.model_id}
+        link, = [m for m in chunks[box.model_id] if m not in
+                 {box.model_id, box.layout.model_id, s2.model_id, s2.style.model_id,
+                  t.model_id, t.layout.model_id, t.style.model_id}]
+        assert widget_module._instances[link].source[0] is s2
+        assert unrelated.model_id not in snippet
+
+    def test_snippet_sharded_cross_link(self):
+        s = IntSlider()
+        t = IntText()
+        link = jslink((s, 'value'), (t, 'value'))
+        snippet = embed_snippet([s, t], sharded=True)
+        shared = json.loads(snippet.split('<script type="application/vnd.jupyter.widget-state+json"')[1]
+                            .split('>', 1)[1].split('</script>')[0])['state']
+        # the link and both of its ends are loaded with the shared state
+        assert {link.model_id, s.model_id, t.model_id} <= set(shared)
+        assert snippet.count(link.model_id) == 1
+
+    def test_snippet_sharded_state(self):
+        s1 = IntSlider()
+        s2 = IntSlider()
+        unrelated = IntText()
+        state = dependency_state([s1, s2, unrelated])
+        snippet = embed_snippet([s1, s2], state=state, sharded=True)
+        shared = json.loads(snippet.split('<script type="application/vnd.jupyter.widget-state+json"')[1]
+                            .split('>', 1)[1].split('</script>')[0])['state']
+        # models of the given state without a view are kept in the shared block
+        assert set(shared) == {unrelated.model_id, unrelated.layout.model_id, unrelated.style.model_id}
+        assert snippet.count('application/vnd.jupyter.widget-state-chunk+json') == 2
+
     def test_snippet(self):
 
         class Parser(HTMLParser):
@@ -194,3 +303,187 @@ class TestEmbed:
         embed_minimal_html(output, views=w, drop_defaults=True, state=state)
         content = output.getvalue()
         assert content.splitlines()[0] == '<!DOCTYPE html>'
+
+    def test_snippet_state_json(self):
+        image = Image(value=b'\x00<script>' * 1000)
+        text = Text('<script> a\nb')
+        box = HBox(children=[image, text])
+        for state in (None, dependency_state(box)):
+            for indent in (None, 0, 2, '\t'):
+                snippet = embed_snippet(box, state=state, indent=indent)
+                data = embed_data(box, state=state)
+                expected = escape_script(json.dumps(data['manager_state'], indent=indent))
+                assert expected in snippet
+
+    def test_minimal_html_streaming(self):
+        class Recorder(StringIO):
+            sizes = []
+            def write(self, s):
+                self.sizes.append(len(s))
+                return super().write(s)
+
+        data = os.urandom(3 * 2**16 * 3)
+        image = Image(value=data)
+        f = Recorder()
+        embed_minimal_html(f, image)
+        content = f.getvalue()
+        assert base64.standard_b64encode(data).decode('ascii') in content
+        # the buffer is written in chunks, not as a whole
+        assert max(f.sizes) < len(data)
+
+    def _html_state(self, content):
+        match = re.search(r'<script type="application/vnd.jupyter.widget-state\+json">(.*?)</script>',
+                          content, re.DOTALL)
+        return json.loads(match.group(1))['state']
+
+    def test_minimal_html_sidecar_files(self):
+        data = os.urandom(1000)
+        image = Image(value=data)
+        tmpd = tempfile.mkdtemp()
+        try:
+            output = os.path.join(tmpd, 'test.html')
+            embed_minimal_html(output, image, sidecar='files')
+            with open(output) as f:
+                content = f.read()
+            assert base64.standard_b64encode(data).decode('ascii') not in content
+            spec, = self._html_state(content)[image.model_id]['buffers']
+            assert spec['encoding'] == 'url'
+            assert spec['path'] == ['value']
+            assert spec['data'] == 'test_buffers/%s-0.bin' % image.model_id
+            with open(os.path.join(tmpd, spec['data']), 'rb') as f:
+                assert f.read() == data
+        finally:
+            shutil.rmtree(tmpd)
+
+    def test_minimal_html_sidecar_packed(self):
+        data1 = os.urandom(1000)
+        data2 = os.urandom(500)
+        image1 = Image(value=data1)
+        image2 = Image(value=data2)
+        tmpd = tempfile.mkdtemp()
+        try:
+            output = os.path.join(tmpd, 'test.html')
+            state = dependency_state([image1, image2])
+            with open(output, 'w') as f:
+                embed_minimal_html(f, [image1, image2], state=state, sidecar='packed')
+            with open(output) as f:
+                state = self._html_state(f.read())
+            with open(os.path.join(tmpd, 'test.bin'), 'rb') as f:
+                packed = f.read()
+            assert len(packed) == 1500
+            for image, data in [(image1, data1), (image2, data2)]:
+                spec, = state[image.model_id]['buffers']
+                assert spec['encoding'] == 'url'
+                assert spec['data'] == 'test.bin'
+                assert packed[spec['offset']:spec['offset'] + spec['length']] == data
+        finally:
+            shutil.rmtree(tmpd)
+
+    def test_minimal_html_sidecar_needs_path(self):
+        with pytest.raises(ValueError):
+            embed_minimal_html(StringIO(), Image(value=b'123'), sidecar='packed')
+
+    def test_embed_data_dedupe_buffers(self):
+        data = os.urandom(100)
+        images = [Image(value=data) for _ in range(3)]
+        other = Image(value=b'other')
+        state = dependency_state(images + [other])
+        manager_state = embed_data(images, state=state, dedupe_buffers=True)['manager_state']
+        table = manager_state['buffers']
+        assert len(table) == 2
+        digests = set()
+        for image in images:
+            spec, = manager_state['state'][image.model_id]['buffers']
+            assert spec['encoding'] == 'shared'
+            assert spec['path'] == ['value']
+            digests.add(spec['data'])
+        digest, = digests
+        assert base64.standard_b64decode(table[digest]['data']) == data
+        # the state passed in is left untouched
+        assert state[other.model_id]['buffers'][0]['encoding'] == 'base64'
+
+    def test_snippet_dedupe_buffers(self):
+        data = os.urandom(100)
+        images = [Image(value=data) for _ in range(3)]
+        snippet = embed_snippet(images, dedupe_buffers=True)
+        manager_state = json.loads(snippet.split('<script type="application/vnd.jupyter.widget-state+json">')[1]
+                                   .split('</script>')[0])
+        assert snippet.count(base64.standard_b64encode(data).decode('ascii')) == 1
+        expected = json.loads(json.dumps(embed_data(images, dedupe_buffers=True)['manager_state']))
+        assert manager_state == expected
+
+    @pytest.mark.parametrize('executor', ['thread', 'process'])
+    def test_minimal_html_batch(self, executor):
+        shared = IntSlider()
+        jobs = []
+        for i in range(3):
+            text = IntText(i)
+            image = Image(value=bytes([i]) * 10)
+            jslink((shared, 'value'), (text, 'value'))
+            jobs.append(([HBox(children=[shared, text]), image], 'report-%d.html' % i))
+        tmpd = tempfile.mkdtemp()
+        try:
+            jobs = [(views, os.path.join(tmpd, name)) for views, name in jobs]
+            embed_minimal_html_batch(jobs, executor=executor, max_workers=2)
+            for views, path in jobs:
+                expected = StringIO()
+                embed_minimal_html(expected, views, state=dependency_state(views))
+                with open(path) as f:
+                    content = f.read()
+                assert self._html_state(content) == self._html_state(expected.getvalue())
+                assert content.count('application/vnd.jupyter.widget-view+json') == 2
+        finally:
+            shutil.rmtree(tmpd)
+
+    def test_minimal_html_batch_default_executor(self):
+        tmpd = tempfile.mkdtemp()
+        try:
+            submit = futures.ProcessPoolExecutor.submit
+            with mock.patch.object(futures.ProcessPoolExecutor, 'submit',
+                                   autospec=True, side_effect=submit) as pool_submit:
+                embed_minimal_html_batch([(IntText(), StringIO())])
+                assert not pool_submit.called
+                embed_minimal_html_batch([(IntText(), os.path.join(tmpd, 'a.html'))])
+                assert pool_submit.called
+        finally:
+            shutil.rmtree(tmpd)
+
+    def test_minimal_html_batch_process_pool_instance(self):
+        tmpd = tempfile.mkdtemp()
+        try:
+            image = Image(value=b'\x00' * 10)
+            path = os.path.join(tmpd, 'a.html')
+            with futures.ProcessPoolExecutor(1) as pool:
+                embed_minimal_html_batch([(image, path)], executor=pool)
+            expected = StringIO()
+            embed_minimal_html(expected, image, state=dependency_state(image))
+            with open(path) as f:
+                assert self._html_state(f.read()) == self._html_state(expected.getvalue())
+        finally:
+            shutil.rmtree(tmpd)
+
+    def test_minimal_html_batch_bad_executor(self):
+        with pytest.raises(ValueError):
+            embed_minimal_html_batch([(IntText(), StringIO())], executor='inline')
+
+    def _decompress_blocks(self, snippet):
+        return [json.loads(gzip.decompress(base64.standard_b64decode(data)))
+                for data in re.findall(r'data-encoding="gzip\+base64">\s*(.*?)\s*</script>',
+                                       snippet, re.DOTALL)]
+
+    def test_snippet_compress(self):
+        w = Text(value='text ' * 1000)
+        plain = embed_snippet(w, state=dependency_state(w))
+        compressed = embed_snippet(w, state=dependency_state(w), compress=True)
+        assert len(compressed) < len(plain) / 5
+        state, = self._decompress_blocks(compressed)
+        assert state['state'] == self._html_state(plain)
+        assert compressed.count('application/vnd.jupyter.widget-view+json') == 1
+
+    def test_snippet_compress_sharded(self):
+        views = [IntSlider(), IntSlider()]
+        snippet = embed_snippet(views, sharded=True, compress=True)
+        shared, chunk1, chunk2 = self._decompress_blocks(snippet)
+        assert shared['state'] == {}
+        assert views[0].model_id in chunk1['state']
+        assert views[1].model_id in chunk2['state']
@@ -0,0 +1,110 @@
+import gc
+import weakref
+
+from .. import memory
+from ..widgets import Image, IntSlider, HBox, Layout, Widget, widget as widget_module
+from ..memory import memory_report
+
+
+class TestMemoryReport:
+
+    def setup_method(self):
+        Widget.close_all()
+
+    def teardown_method(self):
+        Widget.close_all()
+
+    def test_report(self):
+        image = Image(value=b'x' * 1000)
+        slider = IntSlider()
+        box = HBox(children=[image, slider])
+        Layout()
+
+        report = memory_report(top=2)
+        assert report['widget_count'] == len(widget_module._instances)
+        assert report['buffer_bytes'] == 1000
+
+        image_stats = report['widgets'][image.model_id]
+        assert image_stats['class'] == 'Image'
+        assert image_stats['buffer_bytes'] == 1000
+        assert image_stats['total_bytes'] > 1000
+
+        box_stats = report['widgets'][box.model_id]
+        assert box_stats['buffer_bytes'] == 0
+        assert box_stats['total_bytes'] > image_stats['total_bytes']
+        assert report['top'] == [box.model_id, image.model_id]
+
+        assert report['classes']['IntSlider']['count'] == 1
+        assert report['classes']['Layout']['count'] == 4
+        assert report['orphans'] == {'Layout': 1, 'Style': 0}
+
+    def test_incremental(self):
+        slider = IntSlider()
+        memory_report()
+        entry = memory._sizes[slider]
+        memory_report()
+        assert memory._sizes[slider] is entry
+
+        slider.description = 'a much longer description than before'
+        report = memory_report()
+        assert memory._sizes[slider] is not entry
+        assert report['widgets'][slider.model_id]['json_bytes'] > entry[2]
+
+    def test_closed_widgets(self):
+        slider = IntSlider()
+        model_id = slider.model_id
+        assert model_id in memory_report()['widgets']
+        slider.close()
+        assert model_id not in memory_report()['widgets']
+
+    def test_closed_widgets_released(self):
+        image = Image(value=b'x' * 1000)
+        memory_report()
+        ref = weakref.ref(image)
+        image.close()
+        del image
+        gc.collect()
+        assert ref() is None
+
+    def test_shared_children(self):
+        image = Image(value=b'x' * 1000)
+        left = HBox(children=[image])
+        right = HBox(children=[image])
+        outer = HBox(children=[left, right])
+
+        widgets = memory_report()['widgets']
+        # the shared image and its layout only count once
+        image_total = widgets[image.model_id]['total_bytes']
+        own = lambda w: widgets[w.model_id]['json_bytes'] + widgets[w.model_id]['buffer_bytes']
+        left_only = widgets[left.model_id]['total_bytes'] - image_total
+        right_only = widgets[right.model_id]['total_bytes'] - image_total
+        assert widgets[outer.model_id]['total_bytes'] == \
+            own(outer) + own(outer.layout) + left_only + right_only + image_total
+
+    def test_cycles(self):
+        inner = HBox()
+        outer = HBox(children=[inner])
+        inner.children = [outer]
+        widgets = memory_report()['widgets']
+        assert widgets[inner.model_id]['total_bytes'] == widgets[outer.model_id]['total_bytes']
+        total = sum(widgets[w.model_id]['json_bytes']
+                    for w in (inner, outer, inner.layout, outer.layout))
+        assert widgets[outer.model_id]['total_bytes'] == total
+
+    def test_totals_incremental(self):
+        image = Image(value=b'x' * 1000)
+        box = HBox(children=[image])
+        unrelated = HBox(children=[IntSlider()])
+        memory_report()
+        box_entry = memory._totals[box]
+        unrelated_entry = memory._totals[unrelated]
+
+        image.value = b'x' * 2000
+        widgets = memory_report()['widgets']
+        assert memory._totals[unrelated] is unrelated_entry
+        assert memory._totals[box] is not box_entry
+        assert widgets[box.model_id]['total_bytes'] == box_entry[2] + 1000
+
+        image.close()
+        widgets = memory_report()['widgets']
+        assert widgets[box.model_id]['total_bytes'] < box_entry[2]
@@ -0,0 +1,118 @@
+from io import BytesIO
+import os
+import tempfile
+import shutil
+
+import pytest
+import traitlets
+
+from ..widgets import (IntSlider, Dropdown, Image, HBox, Widget, Text, jslink,
+                       widget_serialization, widget as widget_module)
+from ..widgets.widget import register
+from ..persistence import snapshot, restore
+
+
+@register
+class CycleWidget(Widget):
+    """Widget to test restoring reference cycles"""
+    _model_name = traitlets.Unicode('CycleWidgetModel').tag(sync=True)
+    other = traitlets.Instance(Widget, allow_none=True).tag(sync=True, **widget_serialization)
+
+
+class TestSnapshot:
+
+    def setup_method(self):
+        Widget.close_all()
+
+    def teardown_method(self):
+        Widget.close_all()
+
+    def _roundtrip(self, widgets=None):
+        states = {w.model_id: w.get_state() for w in widget_module._instances.values()}
+        f = BytesIO()
+        snapshot(f, widgets)
+        Widget.close_all()
+        assert not widget_module._instances
+        f.seek(0)
+        return states, restore(f)
+
+    def test_roundtrip(self):
+        slider = IntSlider(5, min=1, max=10, description='x')
+        image = Image(value=b'\x00\x01\x02binary', format='png')
+        dropdown = Dropdown(options=['a', 'b', 'c'], value='b')
+        box = HBox(children=[slider, image, dropdown])
+        ids = [w.model_id for w in (slider, image, dropdown, box)]
+
+        states, restored = self._roundtrip()
+        assert set(restored) == set(states)
+        for model_id, state in states.items():
+            assert restored[model_id].get_state() == state
+            assert widget_module._instances[model_id] is restored[model_id]
+
+        box = restored[ids[3]]
+        assert [w.model_id for w in box.children] == ids[:3]
+        assert box.children[1].value.tobytes() == b'\x00\x01\x02binary'
+        assert box.children[2].value == 'b'
+
+    def test_subset_with_links(self):
+        t1 = Text('a')
+        t2 = Text('b')
+        link = jslink((t1, 'value'), (t2, 'value'))
+        unrelated = IntSlider()
+        ids = [w.model_id for w in (t1, link, unrelated)]
+
+        f = BytesIO()
+        snapshot(f, link)
+        Widget.close_all()
+        f.seek(0)
+        restored = restore(f)
+        assert ids[2] not in restored
+        new_link = restored[ids[1]]
+        assert new_link.source[0].model_id == ids[0]
+        assert new_link.target[0].value == 'b'
+
+    def test_cycle(self):
+        a = CycleWidget()
+        b = CycleWidget(other=a)
+        a.other = b
+        a_id, b_id = a.model_id, b.model_id
+
+        states, restored = self._roundtrip()
+        assert restored[a_id].other is restored[b_id]
+        assert restored[b_id].other is restored[a_id]
+
+    def test_live_models_are_reused(self):
+        slider = IntSlider(3)
+        f = BytesIO()
+        snapshot(f, slider)
+        f.seek(0)
+        restored = restore(f)
+        assert restored[slider.model_id] is slider
+
+    def test_filename(self):
+        slider = IntSlider(7)
+        model_id = slider.model_id
+        tmpd = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpd, 'widgets.snapshot')
+            snapshot(path)
+            Widget.close_all()
+            restored = restore(path)
+        finally:
+            shutil.rmtree(tmpd)
+        assert restored[model_id].value == 7
+
+    def test_unregistered_class(self):
+        class Unregistered(Widget):
+            _model_name = traitlets.Unicode('UnregisteredModel').tag(sync=True)
+
+        f = BytesIO()
+        snapshot(f, Unregistered())
+        Widget.close_all()
+        f.seek(0)
+        with pytest.raises(ValueError):
+            restore(f)
+
+    def test_bad_file(self):
+        with pytest.raises(ValueError):
+            restore(BytesIO(b'not a snapshot, definitely'))
@@ -3,17 +3,36 @@
 
 """Interact with functions using widgets."""
 
+import asyncio
+from bisect import bisect_left
+from collections import OrderedDict
 from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+import contextvars
 from enum import EnumMeta as EnumType
+from functools import partial
+import hashlib
 from inspect import signature, Parameter
-from inspect import getcallargs
+from inspect import getcallargs, iscoroutinefunction
 from inspect import getfullargspec as check_argspec
+import io
+import json
+import multiprocessing
+import pickle
 import sys
+import threading
+import time
+import traceback
 
 from IPython import get_ipython
+from IPython.core.interactiveshell import InteractiveShell
 from . import (Widget, ValueWidget, Text,
     FloatSlider, FloatText, IntSlider, IntText, Checkbox,
-    Dropdown, VBox, Button, DOMWidget, Output)
+    Dropdown, SelectionSlider, VBox, Button, DOMWidget, Output, Label)
+from .widget import _call_after_changes
+from .widget_media import Image
+from .widget_selection import _is_array
 from IPython.display import display, clear_output
 from traitlets import HasTraits, Any, Unicode, observe
 from numbers import Real, Integral
@@ -50,26 +69,557 @@ def show_inline_matplotlib_plots():
         flush_figures()
 
 
-def interactive_output(f, controls):
+class _RateLimiter:
+    """Collapse bursts of calls to a function into fewer calls.
+
+    The calls are scheduled on the running asyncio event loop (the kernel
+    loop). With ``debounce``, the function runs once no call came for
+    ``debounce`` milliseconds. With ``throttle``, it runs at most once every
+    ``throttle`` milliseconds: right away if it did not run recently, and
+    otherwise once at the end of the period. Without a running event loop,
+    the function runs right away. With neither option set, the function runs
+    right away too, except for the calls made while a batch of trait changes
+    is applied (e.g. a frontend update setting several values, or a
+    ``hold_trait_notifications`` block): they result in a single run at the
+    end of the batch. The function takes no arguments, so it should read the
+    latest values itself.
+    """
+
+    def __init__(self, func, debounce=0, throttle=0):
+        self.func = func
+        self.debounce = (debounce or 0) / 1000
+        self.throttle = (throttle or 0) / 1000
+        self._handle = None
+        self._last = None
+
+    def __call__(self, *args):
+        if not (self.debounce or self.throttle):
+            if not _call_after_changes(self.func):
+                self.func()
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.func()
+            return
+        now = loop.time()
+        if self.debounce:
+            self.cancel()
+            when = now + self.debounce
+        elif self._handle is not None:
+            # a call is already scheduled for the end of the period
+            return
+        else:
+            when = now
+        if self.throttle and self._last is not None:
+            when = max(when, self._last + self.throttle)
+        if when <= now:
+            self._run(loop)
+        else:
+            self._handle = loop.call_at(when, self._run, loop)
+
+    def _run(self, loop):
+        self._handle = None
+        self._last = loop.time()
+        self.func()
+
+    def cancel(self):
+        """Cancel the pending call, if any"""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+
+# The outputs being captured in the current thread or task, see _capture_outputs
+_captured_outputs = contextvars.ContextVar('_captured_outputs', default=None)
+_capture_lock = threading.Lock()
+# The number of captures in progress, see _install_capture
+_capture_users = 0
+
+
+class _CapturedStream:
+    """Stream writing to the captured outputs of the current context, if any."""
+
+    def __init__(self, stream, name):
+        self._stream = stream
+        self._name = name
+
+    def write(self, text):
+        outputs = _captured_outputs.get()
+        if outputs is None:
+            return self._stream.write(text)
+        if outputs and outputs[-1].get('name') == self._name:
+            outputs[-1]['text'] += text
+        else:
+            outputs.append({'output_type': 'stream', 'name': self._name, 'text': text})
+        return len(text)
+
+    def flush(self):
+        if _captured_outputs.get() is None:
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def _captured_publish(publish, data, metadata=None, *args, **kwargs):
+    outputs = _captured_outputs.get()
+    if outputs is None:
+        return publish(data, metadata, *args, **kwargs)
+    outputs.append({'output_type': 'display_data', 'data': data, 'metadata': metadata or {}})
+
+
+def _captured_clear_output(clear, wait=False):
+    outputs = _captured_outputs.get()
+    if outputs is None:
+        return clear(wait)
+    # the captured outputs replace the output area at once, so there is
+    # nothing to wait for
+    del outputs[:]
+
+
+def _install_capture():
+    """Install the stream and display wrappers used by _capture_outputs.
+
+    The wrappers replace ``sys.stdout``, ``sys.stderr`` and the publishing
+    methods of the display publisher for the whole process, but only while
+    captures are in progress: `_uninstall_capture` removes them once the last
+    one ends. Outside of a capture, they pass everything through.
+    """
+    global _capture_users
+    with _capture_lock:
+        _capture_users += 1
+        if not isinstance(sys.stdout, _CapturedStream):
+            sys.stdout = _CapturedStream(sys.stdout, 'stdout')
+        if not isinstance(sys.stderr, _CapturedStream):
+            sys.stderr = _CapturedStream(sys.stderr, 'stderr')
+        if InteractiveShell.initialized():
+            pub = InteractiveShell.instance().display_pub
+            if getattr(pub.publish, 'func', None) is not _captured_publish:
+                pub.publish = partial(_captured_publish, pub.publish)
+            if getattr(pub.clear_output, 'func', None) is not _captured_clear_output:
+                pub.clear_output = partial(_captured_clear_output, pub.clear_output)
+
+
+def _uninstall_capture():
+    """Remove the wrappers installed by _install_capture once no capture is in
+    progress anymore.
+
+    A wrapper that was replaced meanwhile, e.g. by a redirection with
+    ``%%capture`` or ``contextlib.redirect_stdout``, is left alone, so the
+    redirection is not undone. It passes everything through once restored,
+    and is removed after the next capture.
+    """
+    global _capture_users
+    with _capture_lock:
+        _capture_users -= 1
+        if _capture_users:
+            return
+        if isinstance(sys.stdout, _CapturedStream):
+            sys.stdout = sys.stdout._stream
+        if isinstance(sys.stderr, _CapturedStream):
+            sys.stderr = sys.stderr._stream
+        if InteractiveShell.initialized():
+            pub = InteractiveShell.instance().display_pub
+            if getattr(pub.publish, 'func', None) is _captured_publish:
+                pub.publish = pub.publish.args[0]
+            if getattr(pub.clear_output, 'func', None) is _captured_clear_output:
+                pub.clear_output = pub.clear_output.args[0]
+
+
+@contextmanager
+def _capture_outputs():
+    """Capture the outputs produced in the current thread or asyncio task.
+
+    Yields the list of captured output messages, in the format of
+    ``Output.outputs``. Unlike the ``Output`` context manager, this does not
+    rely on the parent message, so it works from worker threads, and output
+    produced elsewhere in the meantime still goes where it used to.
+    """
+    _install_capture()
+    outputs = []
+    token = _captured_outputs.set(outputs)
+    try:
+        yield outputs
+    finally:
+        _captured_outputs.reset(token)
+        _uninstall_capture()
+
+
+def _error_output(e):
+    """Return the output message showing an exception"""
+    tb = ''.join(traceback.format_exception(type(e), e, e.__traceback__))
+    return {'output_type': 'error', 'ename': type(e).__name__, 'evalue': str(e),
+            'traceback': tb.splitlines()}
+
+
+def _start_clock():
+    return time.time(), time.perf_counter(), time.thread_time()
+
+
+def _stop_clock(clock, cpu=True):
+    """Return the start time, and the wall and CPU time since then"""
+    started, wall, cpu_time = clock
+    return started, time.perf_counter() - wall, time.thread_time() - cpu_time if cpu else None
+
+
+class _FigureRenderer:
+    """Call an interact function drawing with matplotlib, and render the
+    figure to PNG.
+
+    The function draws on the figure passed as its ``fig`` argument, which
+    is cleared and reused by every call, or returns a figure. The figure has
+    an Agg canvas of its own and is never known to pyplot, so the inline
+    backend never shows it. Calls return the result of the function and the
+    PNG data. The PNG encoding is skipped when the pixels did not change.
+    """
+
+    def __init__(self, f, auto_display):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.f = f
+        self.auto_display = auto_display
+        self.figure = Figure()
+        FigureCanvasAgg(self.figure)
+        self._digest = None
+        self._png = None
+
+    def __call__(self, **kwargs):
+        from matplotlib.figure import Figure
+
+        self.figure.clear()
+        result = self.f(**kwargs)
+        if isinstance(result, Figure):
+            return result, self._render(result)
+        if self.auto_display and result is not None:
+            display(result)
+        return result, self._render(self.figure)
+
+    def _render(self, figure):
+        canvas = figure.canvas
+        if not hasattr(canvas, 'buffer_rgba'):
+            buf = io.BytesIO()
+            figure.savefig(buf, format='png')
+            return buf.getvalue()
+        canvas.draw()
+        pixels = canvas.buffer_rgba()
+        digest = hashlib.sha1(pixels).digest()
+        if digest != self._digest:
+            import numpy as np
+            from matplotlib.image import imsave
+            buf = io.BytesIO()
+            imsave(buf, np.asarray(pixels), format='png')
+            self._digest, self._png = digest, buf.getvalue()
+        return self._png
+
+
+def _call_captured(f, kwargs, auto_display):
+    """Call an interact function.
+
+    Returns its result, outputs, exception and timing (see _stop_clock).
+    """
+    if iscoroutinefunction(f):
+        # in a worker process
+        return asyncio.run(_acall_captured(f, kwargs, auto_display))
+    result = error = None
+    clock = _start_clock()
+    with _capture_outputs() as outputs:
+        try:
+            show_inline_matplotlib_plots()
+            result = f(**kwargs)
+            show_inline_matplotlib_plots()
+            if auto_display and result is not None:
+                display(result)
+        except Exception as e:
+            outputs.append(_error_output(e))
+            result, error = None, e
+    return result, outputs, error, _stop_clock(clock)
+
+
+async def _acall_captured(f, kwargs, auto_display):
+    """Await an interact coroutine function, see _call_captured.
+
+    The CPU time is not measured, since other tasks run meanwhile.
+    """
+    result = error = None
+    clock = _start_clock()
+    with _capture_outputs() as outputs:
+        try:
+            result = await f(**kwargs)
+            if auto_display and result is not None:
+                display(result)
+        except Exception as e:
+            outputs.append(_error_output(e))
+            result, error = None, e
+    return result, outputs, error, _stop_clock(clock, cpu=False)
+
+
+def _call_pickled(data, kwargs, auto_display):
+    """Call an interact function pickled by value, see _process_function"""
+    return _call_captured(pickle.loads(data), kwargs, auto_display)
+
+
+def _start_method():
+    """Return the start method of new worker processes.
+
+    Unlike ``multiprocessing.get_start_method()``, this does not fix the
+    start method of the whole process when it was not set yet, which would
+    make later ``multiprocessing.set_start_method`` calls fail.
+    """
+    method = multiprocessing.get_start_method(allow_none=True)
+    if method is None:
+        # the platform default comes first
+        method = multiprocessing.get_all_start_methods()[0]
+    return method
+
+
+def _process_function(f):
+    """Return how to call f in worker processes: (runner, function or data).
+
+    Worker processes load functions by reference, importing their module.
+    That fails for lambdas and nested functions, and, unless the workers are
+    forked, for the functions defined in a notebook, whose module is
+    ``__main__``. Such functions are pickled by value with cloudpickle, when
+    it is installed.
+    """
+    try:
+        pickle.dumps(f)
+    except Exception:
+        by_reference = False
+    else:
+        by_reference = (getattr(f, '__module__', None) != '__main__' or
+                        _start_method() == 'fork')
+    if by_reference:
+        return _call_captured, f
+    try:
+        import cloudpickle
+    except ImportError:
+        raise ValueError(
+            "executor='process' cannot send %r to the worker processes: they "
+            "only load functions defined in an importable module, unless "
+            "cloudpickle is installed" % (f,)) from None
+    return _call_pickled, cloudpickle.dumps(f)
+
+
+def _outcome(future):
+    """Return the outcome of a finished call, e.g. failing to pickle its result"""
+    try:
+        return future.result()
+    except Exception as e:
+        return None, [_error_output(e)], e, None
+
+
+def _outputs_size(outputs):
+    return len(json.dumps(outputs, default=str))
+
+
+# Upper bounds of the buckets of the time histograms, in milliseconds
+_histogram_bounds = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, float('inf'))
+
+
+class _TimeStats:
+    """Statistics of durations"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = None
+        self.histogram = [0] * len(_histogram_bounds)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+        self.histogram[bisect_left(_histogram_bounds, seconds * 1000)] += 1
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'last': self.last,
+            'mean': self.total / self.count if self.count else None,
+            'max': self.max,
+            'histogram': dict(zip(_histogram_bounds, self.histogram)),
+        }
+
+
+class _InteractStats:
+    """Call counts and timings of an interactive function"""
+
+    def __init__(self):
+        self.changes = 0
+        self.updates = 0
+        self.calls = 0
+        self.errors = 0
+        self.skipped = 0
+        self.cache_hits = 0
+        self.prefetched = 0
+        self.wall_time = _TimeStats()
+        self.cpu_time = _TimeStats()
+        self.queue_delay = _TimeStats()
+        self.output_bytes = None
+        self.total_output_bytes = 0
+
+    def record(self, outcome, requested):
+        """Account for a completed call, requested at the given time"""
+        _, outputs, error, timing = outcome
+        if timing is None:
+            return
+        started, wall, cpu = timing
+        self.calls += 1
+        if error is not None:
+            self.errors += 1
+        self.wall_time.add(wall)
+        if cpu is not None:
+            self.cpu_time.add(cpu)
+        if requested is not None:
+            self.queue_delay.add(max(0.0, started - requested))
+        if outputs is not None:
+            self.output_bytes = _outputs_size(outputs)
+            self.total_output_bytes += self.output_bytes
+
+    def as_dict(self):
+        return {
+            'changes': self.changes,
+            'updates': self.updates,
+            'calls': self.calls,
+            'errors': self.errors,
+            'skipped': self.skipped,
+            'cache_hits': self.cache_hits,
+            'prefetched': self.prefetched,
+            'wall_time': self.wall_time.as_dict(),
+            'cpu_time': self.cpu_time.as_dict(),
+            'queue_delay': self.queue_delay.as_dict(),
+            'output_bytes': self.output_bytes,
+            'total_output_bytes': self.total_output_bytes,
+        }
+
+    def summary(self):
+        """Return a one-line summary of the stats"""
+        text = '{} calls, {} skipped, {} cached'.format(self.calls, self.skipped, self.cache_hits)
+        if self.wall_time.last is not None:
+            text += ' | last {:.0f} ms, mean {:.0f} ms'.format(
+                self.wall_time.last * 1000, self.wall_time.total / self.wall_time.count * 1000)
+        if self.queue_delay.last is not None:
+            text += ', queued {:.0f} ms'.format(self.queue_delay.last * 1000)
+        return text
+
+
+def _cache_key(kwargs):
+    """Return a hashable key for interact values, or None if there is none"""
+    key = tuple(sorted(kwargs.items()))
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        pass
+    try:
+        # e.g. lists or arrays picked in a dropdown
+        return pickle.dumps(key)
+    except Exception:
+        return None
+
+
+# The controls whose neighbouring values are prefetched
+_prefetch_widgets = (IntSlider, FloatSlider, SelectionSlider)
+
+
+def _result_size(result):
+    """Estimate the memory held by the result of an interact function"""
+    if result is None:
+        return 0
+    memory_usage = getattr(result, 'memory_usage', None)
+    if callable(memory_usage):
+        # pandas objects; a DataFrame gives the usage of every column
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum() if hasattr(usage, 'sum') else usage)
+        except Exception:
+            pass
+    nbytes = getattr(result, 'nbytes', None)
+    if isinstance(nbytes, Integral):
+        # NumPy arrays, memoryviews
+        return nbytes
+    if isinstance(result, (tuple, list, set, frozenset)):
+        return sys.getsizeof(result) + sum(_result_size(item) for item in result)
+    if isinstance(result, dict):
+        return sys.getsizeof(result) + sum(_result_size(k) + _result_size(v)
+                                           for k, v in result.items())
+    return sys.getsizeof(result)
+
+
+class _ResultCache:
+    """Least recently used interact outcomes, bounded in count and size.
+
+    The size of an entry is the size of its outputs, serialized to JSON, plus
+    an estimate of the size of its result (see _result_size).
+    """
+
+    def __init__(self, maxsize, maxbytes=0):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, outcome):
+        nbytes = _outputs_size(outcome[1]) + _result_size(outcome[0])
+        if self.maxbytes and nbytes > self.maxbytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[1]
+        self._entries[key] = (outcome, nbytes)
+        self.nbytes += nbytes
+        while len(self._entries) > self.maxsize or (self.maxbytes and self.nbytes > self.maxbytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.nbytes -= size
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+
+def interactive_output(f, controls, debounce=0, throttle=0):
     """Connect widget controls to a function.
 
     This function does not generate a user interface for the widgets (unlike `interact`).
     This enables customisation of the widget user interface layout.
     The user interface layout must be defined and displayed manually.
+
+    Changes of several controls made together, by a single frontend update
+    or in a ``hold_trait_notifications`` block, result in a single call. With ``debounce`` or ``throttle`` (in milliseconds),
+    bursts of control changes are collapsed into fewer calls with the latest
+    values, see :class:`interactive`.
     """
 
     out = Output()
-    def observer(change):
+    def run():
         kwargs = {k:v.value for k,v in controls.items()}
         show_inline_matplotlib_plots()
         with out:
             clear_output(wait=True)
             f(**kwargs)
             show_inline_matplotlib_plots()
+    observer = _RateLimiter(run, debounce, throttle)
     for k,w in controls.items():
         w.observe(observer, 'value')
     show_inline_matplotlib_plots()
-    observer(None)
+    run()
     return out
 
 
@@ -151,7 +701,54 @@ class interactive(VBox):
     __options : dict
         A dict of options. Currently, the only supported keys are
         ``"manual"`` (defaults to ``False``), ``"manual_name"`` (defaults
-        to ``"Run Interact"``) and ``"auto_display"`` (defaults to ``False``).
+        to ``"Run Interact"``), ``"auto_display"`` (defaults to ``False``),
+        ``"debounce"`` and ``"throttle"`` (in milliseconds, default to 0).
+        Changes of several controls made together, by a single frontend
+        update or in a ``hold_trait_notifications`` block, result in a
+        single call. With
+        ``debounce``, the function only runs once the controls did not
+        change for that long; with ``throttle``, it runs at most once per
+        period. Either way it runs with the latest values, on the kernel
+        event loop. With ``"background"`` (defaults to ``False``), the
+        function runs in a worker thread, or as an asyncio task for
+        coroutine functions, so the kernel stays responsive while it runs.
+        Its outputs are captured and shown once it finishes, unless newer
+        values came in meanwhile: only the latest run is shown, and pending
+        runs it supersedes are cancelled. To capture the outputs,
+        ``sys.stdout``, ``sys.stderr`` and the display publisher of the
+        kernel are wrapped for the whole process while such calls run, and
+        restored afterwards. With ``"cache"`` set to a number of
+        entries, the result and outputs of the function are memoized for the
+        most recently used values, so going back to them does not call the
+        function again; ``"cache_bytes"`` also bounds the total size of the
+        cached results and outputs. The size of a result is estimated from
+        its ``nbytes`` for arrays, its ``memory_usage`` for pandas objects,
+        and ``sys.getsizeof`` otherwise, going into tuples, lists and dicts
+        but not into other objects. Calls raising an exception are not cached. With
+        ``"prefetch"`` set to a number of steps, once the function is done,
+        it is also called in a worker thread for the values that many steps
+        away on every ``IntSlider``, ``FloatSlider`` and ``SelectionSlider``
+        and the outcomes are cached, so moving a slider a few steps is
+        instant. Prefetching implies ``"background"``, so updates never
+        wait for a prefetch on the kernel thread. The function is never
+        called concurrently with itself.
+        With ``"executor"`` set to ``"process"`` (instead of ``"thread"``),
+        the function runs in the background in a pool of worker processes,
+        which helps with CPU-bound functions. The arguments and the result
+        of the function must then be picklable. Unless the workers are
+        forked (the default on Linux before Python 3.14), functions defined
+        in the notebook are sent to them with cloudpickle, which must then
+        be installed, and otherwise a ``ValueError`` is raised. Its outputs are sent back,
+        and the process running a superseded call is stopped. Prefetched
+        values are computed in parallel. With ``"show_stats"`` (defaults to
+        ``False``), a line below the output summarizes the :attr:`stats`.
+        With ``"render"`` set to ``"image"`` (instead of ``"output"``), the
+        function draws on the matplotlib figure passed as its ``fig``
+        argument, which is reused by every call, or returns a figure, and
+        the figure is shown in an ``Image`` widget whose value is updated in
+        place, only when the picture changed. This is much smoother than
+        replacing the output. The figure is not managed by pyplot, so the
+        function should draw with its methods (e.g. ``fig.add_subplot()``).
     **kwargs : various, optional
         An interactive widget is created for each keyword argument that is a
         valid widget abbreviation.
@@ -171,6 +768,40 @@ class interactive(VBox):
         self.manual = __options.get("manual", False)
         self.manual_name = __options.get("manual_name", "Run Interact")
         self.auto_display = __options.get("auto_display", False)
+        self.debounce = __options.get("debounce", 0)
+        self.throttle = __options.get("throttle", 0)
+        self.executor = __options.get("executor", "thread")
+        if self.executor not in ('thread', 'process'):
+            raise ValueError("executor must be 'thread' or 'process', not %r" % (self.executor,))
+        self.prefetch = __options.get("prefetch", 0)
+        # prefetched values are computed off the kernel thread, and so must
+        # the updates be, or they would wait for the prefetches to finish
+        self.background = (__options.get("background", False) or
+                           self.executor == 'process' or bool(self.prefetch))
+        self.show_stats = __options.get("show_stats", False)
+        self.render = __options.get("render", "output")
+        if self.render not in ('output', 'image'):
+            raise ValueError("render must be 'output' or 'image', not %r" % (self.render,))
+        self._renderer = None
+        if self.render == 'image':
+            if self.executor == 'process' or iscoroutinefunction(f):
+                raise ValueError("render='image' needs a regular function run in this process")
+            self._renderer = _FigureRenderer(f, self.auto_display)
+            try:
+                takes_figure = 'fig' in signature(f).parameters
+            except (ValueError, TypeError):
+                takes_figure = False
+            if takes_figure:
+                kwargs.setdefault('fig', fixed(self._renderer.figure))
+        if self.executor == 'process':
+            self._process_runner, self._process_f = _process_function(f)
+        self._stats = _InteractStats()
+        self._requested = None
+        self._generation = 0
+        self._pending = None
+        self._prefetching = []
+        self._executor = None
+        self._call_lock = threading.Lock()
 
         new_kwargs = self.find_abbreviations(kwargs)
         # Before we proceed, let's make sure that the user has passed a set of args+kwargs
@@ -186,6 +817,13 @@ class interactive(VBox):
         # Now build the widgets from the abbreviations.
         self.kwargs_widgets = self.widgets_from_abbreviations(new_kwargs)
 
+        cache = __options.get("cache", 0)
+        if self.prefetch and not cache:
+            # room for the current values and all their neighbours
+            sliders = [w for w in self.kwargs_widgets if isinstance(w, _prefetch_widgets)]
+            cache = 1 + 2 * self.prefetch * len(sliders)
+        self._cache = _ResultCache(cache, __options.get("cache_bytes", 0)) if cache else None
+
         # This has to be done as an assignment, not using self.children.append,
         # so that traitlets notices the update. We skip any objects (such as fixed) that
         # are not DOMWidgets.
@@ -196,8 +834,14 @@ class interactive(VBox):
             self.manual_button = Button(description=self.manual_name)
             c.append(self.manual_button)
 
+        if self.render == 'image':
+            self.image = Image(format='png')
+            c.append(self.image)
         self.out = Output()
         c.append(self.out)
+        if self.show_stats:
+            self.stats_label = Label()
+            c.append(self.stats_label)
         self.children = c
 
         # Wire up the widgets
@@ -214,10 +858,47 @@ class interactive(VBox):
                     w.continuous_update = False
                     w.observe(self.update, names='value')
         else:
+            self._scheduler = _RateLimiter(self.update, self.debounce, self.throttle)
             for widget in self.kwargs_widgets:
-                widget.observe(self.update, names='value')
+                widget.observe(self._changed, names='value')
             self.update()
 
+    def _changed(self, change):
+        self._stats.changes += 1
+        if self._requested is None:
+            self._requested = time.time()
+        self._scheduler()
+
+    @property
+    def stats(self):
+        """Statistics of the calls of the function, as a dictionary.
+
+        The entries are:
+            changes: number of changes of the controls
+            updates: number of times the function was asked to run, fewer
+                than the changes with debouncing, throttling or coalescing
+            calls: number of calls of the function, prefetches excluded
+            errors: number of calls raising an exception
+            skipped: number of runs superseded by newer values
+            cache_hits: number of updates served from the cache
+            prefetched: number of calls made to prefetch values
+            wall_time, cpu_time: durations of the calls, in seconds
+            queue_delay: time from the first change of the controls to the
+                start of the call, in seconds
+            output_bytes, total_output_bytes: size of the outputs of the
+                last call, and of all calls, when the outputs are captured
+                (in the background or with a cache)
+
+        Durations are given as dictionaries with their ``count``, ``last``,
+        ``mean`` and ``max`` values, and a ``histogram`` mapping upper
+        bounds in milliseconds to the number of durations in that bucket.
+        """
+        return self._stats.as_dict()
+
+    def _show_stats(self):
+        if self.show_stats:
+            self.stats_label.value = self._stats.summary()
+
     # Callback function
     def update(self, *args):
         """
@@ -229,9 +910,15 @@ class interactive(VBox):
         *args : ignored
             Required for this method to be used as traitlets callback.
         """
+        requested, self._requested = self._requested or time.time(), None
+        self._stats.updates += 1
+        if self.background or self._cache is not None:
+            self._update_captured(requested)
+            return
         self.kwargs = {}
         if self.manual:
             self.manual_button.disabled = True
+        clock = error = None
         try:
             show_inline_matplotlib_plots()
             with self.out:
@@ -240,11 +927,16 @@ class interactive(VBox):
                 for widget in self.kwargs_widgets:
                     value = widget.get_interact_value()
                     self.kwargs[widget._kwarg] = value
-                self.result = self.f(**self.kwargs)
-                show_inline_matplotlib_plots()
-                if self.auto_display and self.result is not None:
-                    display(self.result)
+                clock = _start_clock()
+                if self._renderer is not None:
+                    self.result, self.image.value = self._renderer(**self.kwargs)
+                else:
+                    self.result = self.f(**self.kwargs)
+                    show_inline_matplotlib_plots()
+                    if self.auto_display and self.result is not None:
+                        display(self.result)
         except Exception as e:
+            error = e
             ip = get_ipython()
             if ip is None:
                 self.log.warning("Exception in interact callback: %s", e, exc_info=True)
@@ -253,6 +945,209 @@ class interactive(VBox):
         finally:
             if self.manual:
                 self.manual_button.disabled = False
+            if clock is not None:
+                self._stats.record((self.result, None, error, _stop_clock(clock)), requested)
+                self._show_stats()
+
+    def _update_captured(self, requested):
+        """Run the function with the current values, capturing its outputs.
+
+        The run happens in the background if requested, and is skipped when
+        its outcome is cached.
+        """
+        self._generation += 1
+        generation = self._generation
+        try:
+            kwargs = {w._kwarg: w.get_interact_value() for w in self.kwargs_widgets}
+        except Exception as e:
+            self._finish(generation, (None, [_error_output(e)], e, None))
+            return
+        self.kwargs = kwargs
+        if self._pending is not None:
+            self._stats.skipped += 1
+            if self.executor == 'process' and self._pending.running():
+                # a process can be stopped, unlike a thread, whose run is
+                # left alone and its outcome ignored
+                self._shutdown_executor(terminate=True)
+            else:
+                self._pending.cancel()
+            self._pending = None
+        self._cancel_prefetch()
+        key = None
+        if self._cache is not None:
+            key = _cache_key(kwargs)
+            outcome = self._cache.get(key)
+            if outcome is not None:
+                self._stats.cache_hits += 1
+                self._finish(generation, outcome)
+                return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or not (self.background or iscoroutinefunction(self.f)):
+            if self.executor == 'process':
+                outcome = _outcome(self._submit(kwargs))
+            elif loop is None and iscoroutinefunction(self.f):
+                outcome = asyncio.run(_acall_captured(self.f, kwargs, self.auto_display))
+            else:
+                outcome = self._call(kwargs)
+            self._stats.record(outcome, requested)
+            self._store(key, outcome)
+            self._finish(generation, outcome)
+            return
+        self.add_class('widget-interact-busy')
+        if self.manual:
+            self.manual_button.disabled = True
+        if self.executor != 'process' and iscoroutinefunction(self.f):
+            self._pending = loop.create_task(_acall_captured(self.f, kwargs, self.auto_display))
+            self._pending.add_done_callback(partial(self._done, generation, key, requested))
+        else:
+            self._pending = self._submit(kwargs)
+            self._pending.add_done_callback(
+                lambda future: loop.call_soon_threadsafe(self._done, generation, key, requested, future))
+
+    def _submit(self, kwargs):
+        """Submit a call of the function to the executor, returning its future"""
+        if self._executor is None:
+            if self.executor == 'process':
+                # a context of its own leaves the global start method unset
+                context = multiprocessing.get_context(_start_method())
+                self._executor = ProcessPoolExecutor(mp_context=context)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='interact')
+        if self.executor == 'process':
+            return self._executor.submit(self._process_runner, self._process_f, kwargs,
+                                         self.auto_display)
+        return self._executor.submit(self._call, kwargs)
+
+    def _shutdown_executor(self, terminate=False):
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        if terminate:
+            if hasattr(executor, 'terminate_workers'):
+                # Python >= 3.14
+                executor.terminate_workers()
+                return
+            # Before Python 3.14 there is no public way to stop the workers.
+            # Without the private _processes mapping, the running calls are
+            # left to finish and their results are ignored.
+            processes = getattr(executor, '_processes', None) or {}
+            for process in list(processes.values()):
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _call(self, kwargs):
+        """Call the function in this process"""
+        with self._call_lock:
+            if self._renderer is not None:
+                return _call_captured(self._renderer, kwargs, False)
+            return _call_captured(self.f, kwargs, self.auto_display)
+
+    def _done(self, generation, key, requested, future):
+        if future.cancelled():
+            return
+        outcome = _outcome(future)
+        self._stats.record(outcome, requested)
+        # a superseded run is not shown, but still worth caching
+        self._store(key, outcome)
+        if generation != self._generation:
+            return
+        self._pending = None
+        self._finish(generation, outcome)
+
+    def _store(self, key, outcome):
+        if key is not None and outcome[2] is None:
+            self._cache.put(key, outcome)
+
+    def _finish(self, generation, outcome):
+        """Show the outcome of the latest run"""
+        result, outputs, error, _ = outcome
+        self.remove_class('widget-interact-busy')
+        if self.manual:
+            self.manual_button.disabled = False
+        if self.clear_output:
+            self.out.outputs = tuple(outputs)
+        else:
+            self.out.outputs += tuple(outputs)
+        if error is None:
+            if self._renderer is not None:
+                result, self.image.value = result
+            self.result = result
+        elif get_ipython() is None:
+            self.log.warning("Exception in interact callback: %s", error,
+                             exc_info=(type(error), error, error.__traceback__))
+        self._show_stats()
+        if self.prefetch and self._pending is None:
+            self._start_prefetch()
+
+    def _neighbours(self):
+        """Yield the values next to the current ones, closest first.
+
+        Only the sliders are moved, one at a time.
+        """
+        for step in range(1, self.prefetch + 1):
+            for widget in self.kwargs_widgets:
+                if not isinstance(widget, _prefetch_widgets):
+                    continue
+                if isinstance(widget, SelectionSlider):
+                    values = widget._options_values
+                    candidates = [values[i] for i in (widget.index - step, widget.index + step)
+                                  if 0 <= i < len(values)]
+                else:
+                    candidates = [v for v in (widget.value - step * widget.step,
+                                              widget.value + step * widget.step)
+                                  if widget.min <= v <= widget.max]
+                    if isinstance(widget, FloatSlider):
+                        # avoid float drift, e.g. 0.1 + 0.2
+                        candidates = [round(v, 12) for v in candidates]
+                for value in candidates:
+                    kwargs = dict(self.kwargs)
+                    kwargs[widget._kwarg] = value
+                    yield kwargs
+
+    def _start_prefetch(self):
+        """Compute the outcome for the neighbouring values in the background"""
+        if self.executor != 'process' and iscoroutinefunction(self.f):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        for kwargs in self._neighbours():
+            key = _cache_key(kwargs)
+            if key is None or key in self._cache:
+                continue
+            future = self._submit(kwargs)
+            future.add_done_callback(partial(self._prefetched, loop, key))
+            self._prefetching.append(future)
+
+    def _prefetched(self, loop, key, future):
+        if not future.cancelled() and not loop.is_closed():
+            loop.call_soon_threadsafe(self._store_prefetched, key, _outcome(future))
+
+    def _store_prefetched(self, key, outcome):
+        self._stats.prefetched += 1
+        self._store(key, outcome)
+
+    def _cancel_prefetch(self):
+        for future in self._prefetching:
+            future.cancel()
+        self._prefetching = []
+
+    def close(self, recursive=False):
+        # also called on disposal, possibly of a half-constructed instance
+        if getattr(self, '_scheduler', None) is not None:
+            self._scheduler.cancel()
+        if getattr(self, '_pending', None) is not None:
+            self._pending.cancel()
+            self._pending = None
+        if getattr(self, '_prefetching', None):
+            self._cancel_prefetch()
+        if getattr(self, '_executor', None) is not None:
+            self._shutdown_executor(terminate=self.executor == 'process')
+        super().close(recursive=recursive)
 
     # Find abbreviations
     def signature(self):
@@ -319,20 +1214,24 @@ class interactive(VBox):
         if widget is not None:
             return widget
 
-        # Something iterable (list, dict, generator, ...). Note that str and
-        # tuple should be handled before, that is why we check this case last.
-        if isinstance(abbrev, Iterable):
+        # A NumPy array or pandas Index, typically a grid of parameter values,
+        # or something else iterable (list, dict, generator, ...). Note that
+        # str and tuple should be handled before, that is why we check this
+        # case last.
+        if _is_array(abbrev) and len(abbrev) > 0:
+            widget = cls.widget_from_array(abbrev)
+        elif isinstance(abbrev, Iterable):
             widget = cls.widget_from_iterable(abbrev)
-            if default is not empty:
-                try:
-                    widget.value = default
-                except Exception:
-                    # ignore failure to set default
-                    pass
-            return widget
-
-        # No idea...
-        return None
+        else:
+            # No idea...
+            return None
+        if default is not empty:
+            try:
+                widget.value = default
+            except Exception:
+                # ignore failure to set default
+                pass
+        return widget
 
     @staticmethod
     def widget_from_single_value(o):
@@ -387,6 +1286,13 @@ class interactive(VBox):
                 cls = FloatSlider
             return cls(value=value, min=min, max=max, step=step)
 
+    @staticmethod
+    def widget_from_array(o):
+        """Make a slider from a non-empty one-dimensional NumPy array, or
+        pandas Index or Series. The values are converted by NumPy at once,
+        but each label is still made with str()."""
+        return SelectionSlider(options=o, index=len(o) // 2)
+
     @staticmethod
     def widget_from_iterable(o):
         """Make widgets from an iterable. This should not be done for
@@ -403,7 +1309,10 @@ class interactive(VBox):
     # Return a factory for interactive functions
     @classmethod
     def factory(cls):
-        options = dict(manual=False, auto_display=True, manual_name="Run Interact")
+        options = dict(manual=False, auto_display=True, manual_name="Run Interact",
+                       debounce=0, throttle=0, background=False,
+                       cache=0, cache_bytes=0, prefetch=0, executor='thread',
+                       show_stats=False, render='output')
         return _InteractFactory(cls, options)
 
 
@@ -5,7 +5,15 @@
 
 from unittest.mock import patch
 
+import asyncio
+import sys
+import multiprocessing
+import contextlib
+import io
+import threading
+import json
 import os
+import time
 from enum import Enum
 from collections import OrderedDict
 import pytest
@@ -13,7 +21,7 @@ import pytest
 import ipywidgets as widgets
 
 from traitlets import TraitError, Float
-from ipywidgets import (interact, interact_manual, interactive,
+from ipywidgets import (interact, interact_manual, interactive, interactive_output,
                         interaction, Output, Widget)
 
 #-----------------------------------------------------------------------------
@@ -658,3 +666,521 @@ def test_type_hints():
         },
     )
 
+
+class ClockLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock only moves when the test advances it"""
+
+    def __init__(self):
+        super().__init__()
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    async def advance(self, seconds):
+        """Move the clock forward and run the callbacks that are due"""
+        self.now += seconds
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+
+def run_with_clock(main):
+    loop = ClockLoop()
+    try:
+        return loop.run_until_complete(main(loop))
+    finally:
+        loop.close()
+
+
+def test_interact_debounce():
+    calls = []
+    def f(x):
+        calls.append(x)
+
+    async def main(loop):
+        w = interactive(f, {'debounce': 50}, x=(0, 10))
+        slider = w.children[0]
+        for value in range(1, 4):
+            slider.value = value
+            await loop.advance(0.01)
+        assert calls == [5]
+        await loop.advance(0.049)
+        assert calls == [5, 3]
+
+    run_with_clock(main)
+
+def test_interact_debounce_close():
+    calls = []
+    def f(x):
+        calls.append(x)
+
+    async def main(loop):
+        w = interactive(f, {'debounce': 50}, x=(0, 10))
+        w.children[0].value = 1
+        w.close()
+        await loop.advance(0.1)
+
+    run_with_clock(main)
+    assert calls == [5]
+
+def test_interact_throttle():
+    calls = []
+    def f(x):
+        calls.append(x)
+
+    async def main(loop):
+        w = interact.options(throttle=50)(x=(0, 10)).widget(f)
+        slider = w.children[0]
+        calls.clear()
+        for value in range(1, 6):
+            slider.value = value
+        # the first change runs right away, the others are collapsed
+        assert calls == [1]
+        await loop.advance(0.049)
+        assert calls == [1]
+        await loop.advance(0.001)
+        assert calls == [1, 5]
+
+    run_with_clock(main)
+
+def test_interactive_output_debounce():
+    calls = []
+    def f(x):
+        calls.append(x)
+    slider = widgets.IntSlider()
+
+    async def main(loop):
+        interactive_output(f, {'x': slider}, debounce=30)
+        slider.value = 1
+        slider.value = 2
+        await loop.advance(0.03)
+
+    run_with_clock(main)
+    assert calls == [0, 2]
+
+def test_interact_no_event_loop():
+    calls = []
+    w = interactive(lambda x: calls.append(x), {'debounce': 50}, x=(0, 10))
+    w.children[0].value = 3
+    assert calls == [5, 3]
+
+def test_interact_background(capsys):
+    started = []
+    release = threading.Event()
+    def f(x):
+        started.append(x)
+        release.wait(1)
+        print('x is', x)
+        return x
+
+    async def main():
+        w = interactive(f, {'background': True}, x=(0, 10))
+        assert 'widget-interact-busy' in w._dom_classes
+        slider = w.children[0]
+        # the run with x=1 is still queued when x=2 comes in
+        slider.value = 1
+        slider.value = 2
+        print('kernel output')
+        release.set()
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if 'widget-interact-busy' not in w._dom_classes:
+                break
+        return w
+
+    w = asyncio.run(main())
+    assert started == [5, 2]
+    # output from elsewhere is not captured
+    assert capsys.readouterr().out == 'kernel output\n'
+    assert w.result == 2
+    assert w.out.outputs == ({'output_type': 'stream', 'name': 'stdout', 'text': 'x is 2\n'},)
+    w.close()
+
+def test_capture_outputs_keeps_redirection():
+    captured = threading.Event()
+    release = threading.Event()
+    results = []
+    def worker():
+        with interaction._capture_outputs() as outputs:
+            print('captured')
+            captured.set()
+            release.wait(5)
+        results.append(outputs)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert captured.wait(5)
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        # the capture ending in the worker does not undo this redirection
+        release.set()
+        thread.join()
+        print('redirected')
+    assert buf.getvalue() == 'redirected\n'
+    assert results == [[{'output_type': 'stream', 'name': 'stdout', 'text': 'captured\n'}]]
+
+def test_capture_outputs_uninstalled():
+    stdout, stderr = sys.stdout, sys.stderr
+    with interaction._capture_outputs():
+        with interaction._capture_outputs():
+            assert isinstance(sys.stdout, interaction._CapturedStream)
+        # still in use by the outer capture
+        assert isinstance(sys.stdout, interaction._CapturedStream)
+    assert (sys.stdout, sys.stderr) == (stdout, stderr)
+
+def test_interact_background_coroutine():
+    async def f(x):
+        await asyncio.sleep(0.02)
+        print('x is', x)
+        if x == 7:
+            raise ValueError('no seven')
+
+    async def main():
+        w = interactive(f, {'background': True}, x=(0, 10))
+        slider = w.children[0]
+        slider.value = 1
+        await asyncio.sleep(0.05)
+        assert w.out.outputs[0]['text'] == 'x is 1\n'
+        slider.value = 3
+        slider.value = 7
+        await asyncio.sleep(0)
+        assert 'widget-interact-busy' in w._dom_classes
+        await asyncio.sleep(0.05)
+        return w
+
+    w = asyncio.run(main())
+    assert 'widget-interact-busy' not in w._dom_classes
+    stream, error = w.out.outputs
+    assert stream['text'] == 'x is 7\n'
+    assert error['output_type'] == 'error'
+    assert error['ename'] == 'ValueError'
+
+def test_interact_background_no_event_loop():
+    w = interactive(lambda x: print(x), {'background': True}, x=(0, 10))
+    assert w.out.outputs == ({'output_type': 'stream', 'name': 'stdout', 'text': '5\n'},)
+    w.children[0].value = 3
+    assert w.out.outputs == ({'output_type': 'stream', 'name': 'stdout', 'text': '3\n'},)
+
+def test_interact_cache():
+    calls = []
+    def f(x):
+        calls.append(x)
+        print('x is', x)
+        return x * 2
+
+    w = interactive(f, {'cache': 2}, x=(0, 10))
+    slider = w.children[0]
+    for value in [1, 5, 1, 2, 5]:
+        slider.value = value
+    # 5 was evicted by 2, the least recently used being 5 at that point
+    assert calls == [5, 1, 2, 5]
+    assert w.result == 10
+    assert w.out.outputs == ({'output_type': 'stream', 'name': 'stdout', 'text': 'x is 5\n'},)
+    slider.value = 2
+    assert calls == [5, 1, 2, 5]
+    assert w.result == 4
+    assert w.out.outputs[0]['text'] == 'x is 2\n'
+
+def test_interact_cache_bytes():
+    calls = []
+    def f(n):
+        calls.append(n)
+        print('*' * n)
+
+    w = interact.options(cache=10, cache_bytes=200)(n=(0, 100)).widget(f)
+    slider = w.children[0]
+    slider.value = 90
+    slider.value = 50
+    # the outputs for 50 and 90 do not fit together
+    assert w._cache.nbytes <= 200
+    slider.value = 90
+    assert calls == [50, 90, 50, 90]
+
+def test_interact_cache_bytes_results():
+    calls = []
+    def f(n):
+        calls.append(n)
+        return bytearray(1000)
+
+    w = interactive(f, {'cache': 10, 'cache_bytes': 2500}, n=(0, 100))
+    slider = w.children[0]
+    slider.value = 10
+    slider.value = 20
+    # the results count towards the bound, so only two of them fit
+    assert len(w._cache) == 2
+    assert 2000 < w._cache.nbytes <= 2500
+    slider.value = 50
+    assert calls == [50, 10, 20, 50]
+
+def test_result_size():
+    assert interaction._result_size(None) == 0
+    assert interaction._result_size(memoryview(bytes(100))) == 100
+    assert interaction._result_size((bytes(100), bytes(200))) > 300
+    np = pytest.importorskip('numpy')
+    assert interaction._result_size(np.zeros(1000)) == 8000
+    pd = pytest.importorskip('pandas')
+    assert interaction._result_size(pd.DataFrame({'a': np.zeros(1000)})) >= 8000
+
+def test_interact_cache_unhashable():
+    calls = []
+    w = interactive(lambda x: calls.append(x), {'cache': 4}, x=[[1], [2]])
+    w.children[0].value = [2]
+    w.children[0].value = [1]
+    assert calls == [[1], [2]]
+
+def test_interact_prefetch():
+    calls = []
+    def f(x, y, z):
+        calls.append((x, y, z))
+        print(x, y, z)
+
+    async def main():
+        w = interactive(f, {'prefetch': 1}, x=(0, 10), y=(0.0, 1.0, 0.1),
+                        z=widgets.SelectionSlider(options=['a', 'b', 'c'], value='a'))
+        assert w._cache.maxsize == 7
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(w._cache) == 6:
+                break
+        assert sorted(calls[1:]) == [(4, 0.5, 'a'), (5, 0.4, 'a'), (5, 0.5, 'b'),
+                                     (5, 0.6, 'a'), (6, 0.5, 'a')]
+        del calls[:]
+        w.children[1].value = 0.6
+        await asyncio.sleep(0)
+        # the new values were served from the cache
+        assert (5, 0.6, 'a') not in calls
+        assert w.out.outputs[0]['text'] == '5 0.6 a\n'
+        # the neighbours of the new values get prefetched in turn
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(calls) == 4:
+                break
+        # (5, 0.5, 'a') is still cached
+        assert sorted(calls) == [(4, 0.6, 'a'), (5, 0.6, 'b'), (5, 0.7, 'a'), (6, 0.6, 'a')]
+        w.close()
+
+    asyncio.run(main())
+
+def test_interact_prefetch_does_not_block():
+    release = threading.Event()
+    prefetching = []
+    def f(x):
+        if x != 5:
+            prefetching.append(x)
+            release.wait(5)
+            prefetching.remove(x)
+
+    async def main():
+        w = interactive(f, {'prefetch': 1}, x=(0, 10))
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if prefetching:
+                break
+        # moving the slider does not wait for the running prefetch
+        w.children[0].value = 9
+        await asyncio.sleep(0)
+        assert prefetching
+        assert 'widget-interact-busy' in w._dom_classes
+        release.set()
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if 'widget-interact-busy' not in w._dom_classes:
+                break
+        assert w.kwargs == {'x': 9}
+        w.close()
+
+    asyncio.run(main())
+
+def _in_process(x):
+    print('x is', x)
+    return os.getpid()
+
+def _slow(x):
+    time.sleep(x / 10)
+    print('x is', x)
+
+def test_interact_process():
+    w = interactive(_in_process, {'executor': 'process'}, x=(0, 10))
+    assert w.result != os.getpid()
+    assert w.out.outputs == ({'output_type': 'stream', 'name': 'stdout', 'text': 'x is 5\n'},)
+    w.close()
+
+def test_interact_process_by_value():
+    pytest.importorskip('cloudpickle')
+    offset = 10
+    def f(x):
+        print('x is', x + offset)
+        return os.getpid()
+
+    w = interactive(f, {'executor': 'process'}, x=(0, 10))
+    assert w._process_runner is interaction._call_pickled
+    assert w.result != os.getpid()
+    assert w.out.outputs == ({'output_type': 'stream', 'name': 'stdout', 'text': 'x is 15\n'},)
+    w.close()
+
+def test_interact_process_notebook_function():
+    def f(x):
+        pass
+    f.__module__ = '__main__'
+    with patch.object(interaction.multiprocessing, 'get_start_method', return_value='fork'):
+        assert interaction._process_function(_in_process) == (interaction._call_captured, _in_process)
+    with patch.object(interaction.multiprocessing, 'get_start_method', return_value='spawn'), \
+            patch.dict('sys.modules', {'cloudpickle': None}):
+        # workers that are not forked cannot import the notebook's functions
+        with pytest.raises(ValueError):
+            interactive(f, {'executor': 'process'}, x=(0, 10))
+        assert interaction._process_function(_in_process) == (interaction._call_captured, _in_process)
+
+def test_interact_process_start_method_left_unset():
+    with patch.object(interaction.multiprocessing, 'get_start_method',
+                      return_value=None) as get_start_method:
+        assert interaction._start_method() == multiprocessing.get_all_start_methods()[0]
+    # asking with allow_none does not fix the start method of the process
+    get_start_method.assert_called_once_with(allow_none=True)
+
+def test_interact_process_superseded():
+    async def main():
+        w = interactive(_slow, {'executor': 'process'}, x=(0, 10))
+        await asyncio.sleep(0.1)
+        w.children[0].value = 1
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if 'widget-interact-busy' not in w._dom_classes:
+                break
+        # the run with x=5 was superseded
+        assert w.stats['skipped'] == 1
+        assert w.out.outputs == ({'output_type': 'stream', 'name': 'stdout', 'text': 'x is 1\n'},)
+        w.close()
+
+    asyncio.run(main())
+
+def test_interact_coalesce():
+    calls = []
+    def f(x, y):
+        calls.append((x, y))
+    x = widgets.IntSlider()
+    y = widgets.IntSlider()
+
+    async def main():
+        w = interactive(f, x=x, y=y)
+        interactive_output(f, {'x': x, 'y': y})
+        del calls[:]
+        x.value = 1
+        y.value = 2
+        assert calls == [(1, 0), (1, 0), (1, 2), (1, 2)]
+        del calls[:]
+        with x.hold_trait_notifications(), y.hold_trait_notifications():
+            x.value = 3
+            y.value = 4
+            assert calls == []
+        assert calls == [(3, 4), (3, 4)]
+
+    asyncio.run(main())
+
+def test_interact_coalesce_frontend_update():
+    calls = []
+    def f(x):
+        calls.append(x)
+    w = interactive(f, x=5)
+    slider = w.children[0]
+    widgets.jslink((slider, 'value'), (widgets.IntText(), 'value'))
+    del calls[:]
+    slider.set_state({'value': 7, 'max': 20})
+    assert calls == [7]
+
+def test_interact_sync_in_event_loop():
+    def f(x):
+        return 2 * x
+
+    async def main():
+        w = interactive(f, x=5)
+        w.children[0].value = 7
+        assert w.result == 14
+
+    asyncio.run(main())
+
+def test_interact_stats():
+    def f(x):
+        if x == 3:
+            raise ValueError('no three')
+    w = interactive(f, {'show_stats': True}, x=(0, 10))
+    slider = w.children[0]
+    slider.value = 3
+    slider.value = 4
+    stats = w.stats
+    assert (stats['changes'], stats['updates'], stats['calls'], stats['errors']) == (2, 3, 3, 1)
+    assert stats['wall_time']['count'] == 3
+    assert sum(stats['wall_time']['histogram'].values()) == 3
+    assert stats['queue_delay']['count'] == 3
+    assert stats['output_bytes'] is None
+    assert w.children[-1] is w.stats_label
+    assert w.stats_label.value.startswith('3 calls, 0 skipped, 0 cached | last ')
+
+def test_interact_stats_cache():
+    w = interactive(lambda x: print(x), {'cache': 4}, x=(0, 10))
+    slider = w.children[0]
+    slider.value = 3
+    slider.value = 5
+    stats = w.stats
+    assert (stats['calls'], stats['cache_hits']) == (2, 1)
+    assert stats['output_bytes'] == len(json.dumps(w.out.outputs[0:1]))
+    assert stats['cpu_time']['count'] == 2
+
+def test_array():
+    np = pytest.importorskip('numpy')
+    grid = np.linspace(-1, 1, 100001)
+    c = interactive(f, x=grid, n=np.arange(10))
+    check_widget_children(c,
+        x=dict(cls=widgets.SelectionSlider, index=50000, value=0.0, label='0.0'),
+        n=dict(cls=widgets.SelectionSlider, index=5, value=5),
+    )
+    c = interactive(f, x=np.array([]))
+    check_widget(c.children[0], cls=widgets.Dropdown, options=())
+
+def test_interact_render_image():
+    pytest.importorskip('matplotlib')
+    import matplotlib.pyplot as plt
+    def f(a, fig):
+        fig.add_subplot().plot([0, 1], [0, a])
+
+    w = interactive(f, {'render': 'image', 'cache': 4}, a=(0, 10))
+    assert w.children[1] is w.image
+    first = bytes(w.image.value)
+    assert first.startswith(b'\x89PNG')
+    figure = w._renderer.figure
+    assert w.kwargs['fig'] is figure
+    w.children[0].value = 7
+    assert w._renderer.figure is figure
+    assert len(figure.axes) == 1
+    assert w.image.value != first
+    # the figure is never known to pyplot
+    assert plt.get_fignums() == []
+    w.children[0].value = 5
+    assert w.image.value == first
+
+def test_interact_render_image_returned():
+    pytest.importorskip('matplotlib')
+    from matplotlib.figure import Figure
+    def f(a):
+        fig = Figure()
+        fig.add_subplot().plot([0, 1], [0, a])
+        return fig
+
+    w = interactive(f, {'render': 'image'}, a=(0, 10))
+    assert bytes(w.image.value).startswith(b'\x89PNG')
+    assert isinstance(w.result, Figure)
+
+def test_interact_render_image_unchanged():
+    pytest.importorskip('matplotlib')
+    w = interactive(lambda a, fig: fig.add_subplot().plot([0, 1]), {'render': 'image'}, a=(0, 10))
+    changes = []
+    w.image.observe(changes.append, 'value')
+    w.children[0].value = 7
+    # the pixels did not change, so neither did the value
+    assert changes == []
+
+def test_interact_render_options():
+    with pytest.raises(ValueError):
+        interactive(f, {'render': 'svg'}, a=1)
+    with pytest.raises(ValueError):
+        interactive(f, {'render': 'image', 'executor': 'process'}, a=1)
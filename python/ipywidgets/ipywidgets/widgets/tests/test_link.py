@@ -4,6 +4,7 @@
 import pytest
 
 from .. import jslink, jsdlink, ToggleButton
+from ..widget_link import _links_within, _links_by_endpoint
 
 def test_jslink_args():
     with pytest.raises(TypeError):
@@ -36,3 +37,23 @@ def test_jsdlink_args():
 
     with pytest.raises(TypeError):
         jsdlink((w1, 'value'), (w2, 'traits'))
+
+def test_link_index():
+    w1 = ToggleButton()
+    w2 = ToggleButton()
+    w3 = ToggleButton()
+    link = jslink((w1, 'value'), (w2, 'value'))
+    dlink = jsdlink((w2, 'value'), (w3, 'value'))
+    ids = {w.model_id for w in (w1, w2, w3)}
+    assert set(_links_within(ids)) == {link, dlink}
+    assert _links_within({w1.model_id, w2.model_id}) == [link]
+    assert _links_within({w1.model_id, w3.model_id}) == []
+
+    link.target = (w3, 'value')
+    assert _links_within({w1.model_id, w2.model_id}) == []
+    assert set(_links_within({w1.model_id, w3.model_id})) == {link}
+
+    link.close()
+    dlink.unlink()
+    assert _links_within(ids) == []
+    assert all(w.model_id not in _links_by_endpoint for w in (w1, w2, w3))
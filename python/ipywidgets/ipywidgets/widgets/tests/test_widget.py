@@ -4,14 +4,17 @@
 """Test Widget."""
 
 import inspect
+import sys
 
 import pytest
+from traitlets import Any, Dict, Instance, Tuple
 from IPython.core.interactiveshell import InteractiveShell
 from IPython.display import display
 from IPython.utils.capture import capture_output
 
 from .. import widget
-from ..widget import Widget
+from ..widget import Widget, widget_serialization
+from ..widget_box import HBox
 from ..widget_button import Button
 import copy
 
@@ -88,4 +91,83 @@ def test_widget_copy():
     with pytest.raises(NotImplementedError):
         copy.copy(button)
     with pytest.raises(NotImplementedError):
-        copy.deepcopy(button)
\ No newline at end of file
+        copy.deepcopy(button)
+
+def test_close_recursive():
+    button = Button()
+    box = HBox(children=[button, Button(layout=button.layout)])
+    tree = [box, box.layout, button, button.layout, button.style,
+            box.children[1], box.children[1].style]
+    assert all(w.model_id in widget._instances for w in tree)
+
+    box.close(recursive=True)
+    assert all(w.comm is None for w in tree)
+    assert not any(w in widget._instances.values() for w in tree)
+
+
+def test_close_recursive_links():
+    from ..widget_int import IntSlider
+    from ..widget_link import jslink, _links_by_endpoint
+    inner = [IntSlider(), IntSlider()]
+    outer = IntSlider()
+    box = HBox(children=inner)
+    link = jslink((inner[0], 'value'), (inner[1], 'value'))
+    outer_link = jslink((inner[0], 'value'), (outer, 'value'))
+
+    box.close(recursive=True)
+    # the frontend drops closed link models, so values stop propagating
+    assert link.comm is None
+    assert not any(link in links for links in _links_by_endpoint.values())
+    # links to widgets outside the tree are left to their owner
+    assert outer_link.comm is not None
+    outer_link.close()
+    outer.close()
+
+def test_close_recursive_deep():
+    class ChainWidget(Widget):
+        child = Instance(Widget, allow_none=True).tag(sync=True, **widget_serialization)
+
+    chain = [ChainWidget()]
+    for _ in range(sys.getrecursionlimit() + 100):
+        chain.append(ChainWidget(child=chain[-1]))
+    chain[-1].close(recursive=True)
+    assert all(w.comm is None for w in chain)
+
+
+def test_find_widget_refs_nested():
+    class NestedWidget(Widget):
+        nested = Dict().tag(sync=True, **widget_serialization)
+        unserialized = Dict().tag(sync=True)
+
+    buttons = [Button() for _ in range(3)]
+    w = NestedWidget(nested={'a': [buttons[0], {'b': (buttons[1], [buttons[2]])}]},
+                     unserialized={'a': 1})
+    assert list(widget._find_widget_refs(w, w.keys)) == buttons
+
+
+def test_get_state_drop_defaults():
+    class DefaultsWidget(Widget):
+        flag = Any(0).tag(sync=True)
+        items = Tuple().tag(sync=True, **widget_serialization)
+        data = Any(b'abc').tag(sync=True)
+
+    w = DefaultsWidget()
+    # serialized defaults are compared with the serialized values
+    assert w.get_state(drop_defaults=True) == {}
+    w.data = memoryview(b'abc')
+    assert 'data' not in w.get_state(drop_defaults=True)
+    # booleans are not numbers in JSON
+    w.flag = False
+    assert w.get_state(drop_defaults=True) == {'flag': False}
+    w.items = (Button(),)
+    assert list(w.get_state(drop_defaults=True)) == ['flag', 'items']
+    assert 'children' not in HBox().get_state(drop_defaults=True)
+
+
+def test_close_not_recursive():
+    button = Button()
+    box = HBox(children=[button])
+    box.close()
+    assert box.comm is None
+    assert button.model_id in widget._instances
+    assert button.layout.model_id in widget._instances
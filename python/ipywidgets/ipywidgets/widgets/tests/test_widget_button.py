@@ -2,11 +2,182 @@
 # Distributed under the terms of the Modified BSD License.
 
 import inspect
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock
+
 import pytest
 from ipywidgets import Button
+from ipywidgets.widgets import widget, CallbackDispatcher
 
 def test_deprecation_fa_icons():
     with pytest.deprecated_call() as record:
         Button(icon='fa-home')
     assert len(record) == 1
     assert record[0].filename == inspect.stack(context=0)[1].filename
+
+
+def test_on_click_inline():
+    button = Button()
+    clicked = []
+    button.on_click(lambda b: clicked.append(threading.get_ident()))
+    button.click()
+    assert clicked == [threading.get_ident()]
+
+
+def test_on_click_thread_executor():
+    button = Button()
+    done = threading.Event()
+    threads = []
+
+    def callback(b):
+        threads.append(threading.get_ident())
+        done.set()
+
+    button.on_click(callback, executor='thread')
+    button.click()
+    assert done.wait(5)
+    assert threads and threads[0] != threading.get_ident()
+    button._click_handlers.shutdown()
+
+
+def test_on_click_drop_if_running():
+    button = Button()
+    release = threading.Event()
+    calls = []
+
+    def callback(b):
+        calls.append(b)
+        release.wait(5)
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    button.on_click(callback, executor=executor, drop_if_running=True)
+    try:
+        button.click()
+        button.click()
+        release.set()
+    finally:
+        executor.shutdown(wait=True)
+    assert calls == [button]
+
+    # once the previous call finished, clicks run the callback again
+    executor = ThreadPoolExecutor(max_workers=2)
+    button.on_click(callback, executor=executor, drop_if_running=True)
+    button.click()
+    executor.shutdown(wait=True)
+    assert calls == [button, button]
+
+
+def test_on_click_executor_exception():
+    reported = []
+
+    class FakeShell:
+        def showtraceback(self, exc_tuple=None):
+            reported.append(exc_tuple)
+
+    def callback(b):
+        raise ValueError('boom')
+
+    button = Button()
+    executor = ThreadPoolExecutor(max_workers=1)
+    with mock.patch.object(widget, 'get_ipython', FakeShell):
+        button.on_click(callback, executor=executor)
+        button.click()
+        executor.shutdown(wait=True)
+    assert len(reported) == 1
+    assert reported[0][0] is ValueError
+
+
+def test_on_click_invalid_executor():
+    button = Button()
+    with pytest.raises(ValueError):
+        button.on_click(lambda b: None, executor='gpu')
+
+
+def test_on_click_process_executor_rejected():
+    button = Button()
+    with pytest.raises(ValueError):
+        button.on_click(lambda b: None, executor='process')
+    executor = ProcessPoolExecutor(max_workers=1)
+    try:
+        with pytest.raises(ValueError):
+            button.on_click(lambda b: None, executor=executor)
+    finally:
+        executor.shutdown()
+
+
+def test_button_picklable():
+    button = Button()
+    pickle.dumps(button)
+    button.on_click(print, executor='thread')
+    button._click_handlers._get_executor('thread')
+    handlers = pickle.loads(pickle.dumps(button._click_handlers))
+    assert handlers.callbacks == [print] and not handlers.picklable_args
+    button._click_handlers.shutdown()
+
+
+def _raise_pid(value):
+    raise ValueError(os.getpid(), value)
+
+
+def test_dispatcher_process_executor():
+    reported = []
+
+    class FakeShell:
+        def showtraceback(self, exc_tuple=None):
+            reported.append(exc_tuple)
+
+    dispatcher = CallbackDispatcher(executor='process', max_workers=1)
+    dispatcher.register_callback(_raise_pid)
+    with mock.patch.object(widget, 'get_ipython', FakeShell):
+        dispatcher(42)
+        dispatcher.shutdown(wait=True)
+    assert len(reported) == 1
+    assert reported[0][0] is ValueError
+    pid, value = reported[0][1].args
+    assert pid != os.getpid() and value == 42
+
+
+class _UnhashableCallback:
+    __hash__ = None
+
+    def __init__(self):
+        self.calls = []
+
+    def __eq__(self, other):
+        return self is other
+
+    def __call__(self, *args):
+        self.calls.append(args)
+
+
+def test_dispatcher_unhashable_callback():
+    callback = _UnhashableCallback()
+    dispatcher = CallbackDispatcher()
+    dispatcher.register_callback(print, executor='inline', drop_if_running=True)
+    dispatcher.register_callback(callback)
+    dispatcher.register_callback(print, remove=True)
+    dispatcher(1)
+    dispatcher.register_callback(lambda x: None, executor='inline', drop_if_running=True)
+    dispatcher(2)
+    assert callback.calls == [(1,), (2,)]
+
+    dispatcher.executor = 'thread'
+    dispatcher(3)
+    dispatcher.shutdown(wait=True)
+    assert callback.calls == [(1,), (2,), (3,)]
+    dispatcher.register_callback(callback, remove=True)
+    assert dispatcher.callbacks == [dispatcher.callbacks[0]]
+
+
+def test_dispatcher_max_workers_change():
+    dispatcher = CallbackDispatcher(executor='thread', max_workers=1)
+    pool = dispatcher._get_executor('thread')
+    assert pool._max_workers == 1
+    dispatcher.max_workers = 3
+    assert pool._shutdown
+    pool = dispatcher._get_executor('thread')
+    assert pool._max_workers == 3
+    dispatcher.shutdown()
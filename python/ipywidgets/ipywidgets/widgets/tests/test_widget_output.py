@@ -1,5 +1,5 @@
 import sys
-from unittest import TestCase
+from unittest import TestCase, mock
 from contextlib import contextmanager
 
 from IPython.display import Markdown, Image
@@ -237,3 +237,89 @@ def test_append_display_data():
         },
     )
     assert widget.outputs == expected1 or widget.outputs == expected2
+
+
+def test_max_outputs():
+    widget = widget_output.Output(max_outputs=3)
+    for i in range(5):
+        widget.append_stdout("%d\n" % i)
+    expected = tuple(_make_stream_output("%d\n" % i, "stdout") for i in range(2, 5))
+    assert widget.outputs == expected, repr(widget.outputs)
+
+    # Lowering the bound drops the oldest outputs right away.
+    widget.max_outputs = 1
+    assert widget.outputs == expected[-1:], repr(widget.outputs)
+
+
+def test_max_bytes():
+    widget = widget_output.Output(max_bytes=200)
+    for i in range(10):
+        widget.append_stderr("%d" % i * 50)
+    assert len(widget.outputs) == 2
+    assert widget.outputs[-1] == _make_stream_output("9" * 50, "stderr")
+
+    # The newest output is kept even when it is larger than the bound.
+    widget.append_stdout("x" * 500)
+    assert widget.outputs == (_make_stream_output("x" * 500, "stdout"),)
+
+
+def test_output_size_utf8():
+    output = _make_stream_output("é…", "stdout")
+    # bytes of the compact JSON encoded as UTF-8, as the front-end counts them
+    compact = '{"output_type":"stream","name":"stdout","text":"é…"}'
+    assert widget_output._output_size(output) == len(compact.encode()) == len(compact) + 3
+
+
+def test_bounded_outputs_send_tail():
+    widget = widget_output.Output(max_outputs=2)
+    widget.append_stdout("snakes!")
+
+    with mock.patch.object(widget, '_send') as send:
+        widget.append_stdout("more snakes!")
+        widget.append_stderr("still snakes!")
+    assert [call.args[0] for call in send.call_args_list] == [
+        {'method': 'custom', 'content': {
+            'method': 'append_outputs',
+            'outputs': [_make_stream_output("more snakes!", "stdout")]}},
+        {'method': 'custom', 'content': {
+            'method': 'append_outputs',
+            'outputs': [_make_stream_output("still snakes!", "stderr")]}},
+    ]
+    assert widget.outputs == (
+        _make_stream_output("more snakes!", "stdout"),
+        _make_stream_output("still snakes!", "stderr"),
+    )
+
+
+def test_bounded_outputs_append_cost():
+    widget = widget_output.Output(max_outputs=1000)
+    for i in range(1000):
+        widget.append_stdout("%d\n" % i)
+    trait = widget_output.Output.outputs
+    with mock.patch.object(widget, '_send') as send, \
+            mock.patch.object(type(trait), 'validate', autospec=True) as validate, \
+            mock.patch.object(type(trait._trait), 'validate', autospec=True,
+                              side_effect=lambda self, obj, value: value) as validate_output:
+        widget.append_stdout("more snakes!")
+    # only the appended output is validated, not the whole tuple
+    validate.assert_not_called()
+    assert validate_output.call_count == 1
+    assert [call.args[0] for call in send.call_args_list] == [
+        {'method': 'custom', 'content': {
+            'method': 'append_outputs',
+            'outputs': [_make_stream_output("more snakes!", "stdout")]}},
+    ]
+    assert len(widget.outputs) == 1000
+    assert widget.outputs[0] == _make_stream_output("1\n", "stdout")
+    assert widget.outputs[-1] == _make_stream_output("more snakes!", "stdout")
+
+
+def test_bounded_outputs_set_from_frontend():
+    widget = widget_output.Output(max_outputs=2)
+    widget.append_stdout("snakes!")
+    widget.set_state({'outputs': [_make_stream_output("from the frontend", "stdout")]})
+    widget.append_stdout("more snakes!")
+    assert widget.outputs == (
+        _make_stream_output("from the frontend", "stdout"),
+        _make_stream_output("more snakes!", "stdout"),
+    )
@@ -4,6 +4,8 @@
 import inspect
 from unittest import TestCase
 
+import pytest
+
 from traitlets import TraitError
 
 from ipywidgets import Dropdown, SelectionSlider, Select
@@ -59,6 +61,32 @@ class TestSelectionSlider(TestCase):
         assert slider.label == '4'
         assert observations == [0]
 
+    def test_array_options(self):
+        np = pytest.importorskip('numpy')
+        grid = np.linspace(0, 1, 101)
+        slider = SelectionSlider(options=grid, index=10)
+        assert slider.options == tuple(grid.tolist())
+        assert type(slider.options[0]) is float
+        assert slider.value == 0.1
+        # the options are a copy, which later changes of the array do not affect
+        grid[10] = 2
+        assert slider.options[10] == 0.1
+        assert slider.value == 0.1
+        assert slider.label == '0.1'
+        assert len(slider._options_labels) == 101
+        slider.options = np.arange(3)
+        assert slider.options == (0, 1, 2)
+        assert slider._options_labels == ('0', '1', '2')
+        assert slider.value == 0
+        assert bool(SelectionSlider(options=np.arange(1)).options)
+
+    def test_array_values(self):
+        np = pytest.importorskip('numpy')
+        options = [('a', np.array([1, 2])), ('b', np.array([3, 4]))]
+        # comparing arrays raises ValueError, reported like any invalid value
+        with pytest.raises(TraitError):
+            Dropdown(options=options)
+
 class TestSelection(TestCase):
 
     def test_construction(self):
@@ -456,6 +456,12 @@ class TypedTuple(traitlets.Container):
     klass = tuple
     _cast_types = (list,)
 
+    def validate_elements(self, obj, value):
+        if type(self._trait) is traitlets.Unicode and all(type(v) is str for v in value):
+            # e.g. the labels of many options, valid as they are
+            return value
+        return super().validate_elements(obj, value)
+
 
 def bytes_from_json(js, obj):
     return None if js is None else js.tobytes()
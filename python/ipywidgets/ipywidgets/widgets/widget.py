@@ -7,13 +7,16 @@ in the Jupyter notebook front-end.
 """
 import os
 import sys
+import threading
 import typing
+import weakref
+from concurrent import futures
 from contextlib import contextmanager
 from collections.abc import Iterable
 from IPython import get_ipython
 from traitlets import (
-    Any, HasTraits, Unicode, Dict, Instance, List, Int, Set, Bytes, observe, default, Container,
-    Undefined)
+    Any, Bool, HasTraits, Unicode, Dict, Instance, List, Int, Set, Bytes, observe, default, validate,
+    Container, Undefined)
 from json import loads as jsonloads, dumps as jsondumps
 from .. import comm
 
@@ -72,6 +75,46 @@ widget_serialization = {
 
 _binary_types = (memoryview, bytearray, bytes)
 
+# executor policies understood by CallbackDispatcher
+_EXECUTOR_POLICIES = ('inline', 'thread', 'process')
+
+# Per-thread state of the batch of trait changes being applied, see _batch_changes
+_batch = threading.local()
+
+
+@contextmanager
+def _batch_changes():
+    """Group the trait changes made in the block into a batch.
+
+    Widgets open a batch while holding trait notifications, which they do
+    when applying a state received from the front-end. Callbacks deferred
+    with `_call_after_changes` while a batch is open run once each, when
+    the outermost batch ends.
+    """
+    depth = getattr(_batch, 'depth', 0)
+    if depth == 0:
+        _batch.deferred = {}
+    _batch.depth = depth + 1
+    try:
+        yield
+    finally:
+        _batch.depth = depth
+        if depth == 0:
+            deferred, _batch.deferred = _batch.deferred, None
+            for callback in deferred:
+                callback()
+
+
+def _call_after_changes(callback):
+    """Defer a callback to the end of the current batch of trait changes.
+
+    Returns False, without deferring the callback, when no batch is open.
+    """
+    if not getattr(_batch, 'depth', 0):
+        return False
+    _batch.deferred[callback] = None
+    return True
+
 def _put_buffers(state, buffer_paths, buffers):
     """The inverse of _remove_buffers, except here we modify the existing dict/lists.
     Modifying should be fine, since this is used when state comes from the wire.
@@ -167,6 +210,106 @@ def _buffer_list_equal(a, b):
     return True
 
 
+# widget class -> names of the traits that can hold widget references
+_ref_traits_cache = weakref.WeakKeyDictionary()
+
+def _widget_ref_traits(cls):
+    """Return the names of the traits of a widget class that can refer to widgets.
+
+    Widget references are only serialized by `widget_serialization`, so only
+    the traits using it can hold them.
+    """
+    try:
+        return _ref_traits_cache[cls]
+    except KeyError:
+        names = frozenset(name for name, trait in cls.class_traits().items()
+                          if trait.metadata.get('to_json') is _widget_to_json)
+        _ref_traits_cache[cls] = names
+        return names
+
+def _iter_widget_refs(value):
+    """Yield the widgets in a value, at any nesting depth of lists, tuples and dicts"""
+    stack = [value]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, Widget):
+            yield x
+        elif isinstance(x, dict):
+            stack.extend(reversed(list(x.values())))
+        elif isinstance(x, (list, tuple)):
+            stack.extend(reversed(x))
+
+def _find_widget_refs(widget, keys):
+    """Find references to other widgets in the given traits of a widget"""
+    ref_traits = _widget_ref_traits(type(widget))
+    # Copy keys to allow changes to state during iteration:
+    for key in tuple(keys):
+        if key in ref_traits:
+            yield from _iter_widget_refs(getattr(widget, key))
+
+def _find_widget_refs_by_state(widget, state):
+    """Find references to other widgets in a widget's state"""
+    return _find_widget_refs(widget, state.keys())
+
+def _state_refs(x):
+    """Yield the model ids referenced in a serialized state"""
+    stack = [x]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, dict):
+            stack.extend(x.values())
+        elif isinstance(x, (list, tuple)):
+            stack.extend(x)
+        elif isinstance(x, str) and x.startswith('IPY_MODEL_'):
+            yield x[10:]
+
+def _widget_tree(widget):
+    """Return a widget and all the widgets it refers to, directly or not"""
+    tree = [widget]
+    seen = {id(widget)}
+    for w in tree:
+        for ref in _find_widget_refs(w, w.keys):
+            if id(ref) not in seen:
+                seen.add(id(ref))
+                tree.append(ref)
+    return tree
+
+
+def _is_numpy(x):
+    return x.__class__.__name__ == 'ndarray' and x.__class__.__module__ == 'numpy'
+
+def _json_equal(a, b):
+    """Compare two serialized values as their JSON (and binary) forms would.
+
+    Lists and tuples compare equal, as do bytes-like objects with the same
+    bytes, while booleans never equal numbers.
+    """
+    if a is b:
+        return True
+    if _is_numpy(a) or _is_numpy(b):
+        import numpy as np
+        return bool(np.array_equal(a, b))
+    if isinstance(a, (list, tuple)):
+        return (isinstance(b, (list, tuple)) and len(a) == len(b)
+                and all(_json_equal(x, y) for x, y in zip(a, b)))
+    if isinstance(a, dict):
+        return (isinstance(b, dict) and a.keys() == b.keys()
+                and all(_json_equal(a[k], b[k]) for k in a))
+    if isinstance(a, (bytes, bytearray, memoryview)):
+        return (isinstance(b, (bytes, bytearray, memoryview))
+                and memoryview(a).cast('B') == memoryview(b).cast('B'))
+    if isinstance(a, bool) != isinstance(b, bool):
+        return False
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+_NO_DEFAULT = object()
+# widget class -> {trait name: [trait, to_json metadata, serialized default]}
+_serialization_cache = weakref.WeakKeyDictionary()
+
+
 class LoggingHasTraits(HasTraits):
     """A parent class for HasTraits that log.
     Subclasses have a log trait, and the default behavior
@@ -180,26 +323,97 @@ class LoggingHasTraits(HasTraits):
 
 
 class CallbackDispatcher(LoggingHasTraits):
-    """A structure for registering and running callbacks"""
+    """A structure for registering and running callbacks
+
+    By default callbacks run inline, on the thread that triggered them. An
+    executor policy can be set for the whole dispatcher (``executor``) or per
+    callback (see ``register_callback``):
+
+    - ``'inline'``: run the callback synchronously (the default).
+    - ``'thread'``: run the callback in a thread pool owned by the dispatcher.
+    - ``'process'``: run the callback in a process pool owned by the
+      dispatcher. The callback and its arguments must be picklable.
+    - a ``concurrent.futures.Executor`` instance to submit the callback to.
+
+    The pools created by the dispatcher run at most ``max_workers`` callbacks
+    concurrently; changing ``max_workers`` shuts the current pools down
+    (letting submitted callbacks finish) and later calls use new pools of the
+    new size. Exceptions raised by asynchronously run callbacks are
+    reported in the same way as for inline callbacks.
+
+    Dispatchers whose callbacks get a widget as argument, such as the click
+    handlers of a button, are created with ``picklable_args=False`` and
+    reject the ``'process'`` policy and process pools.
+    """
     callbacks = List()
+    executor = Any('inline', help="Default executor policy for the callbacks.")
+    max_workers = Int(None, allow_none=True,
+        help="Maximum number of workers of the pools created by the dispatcher.")
+    picklable_args = Bool(True,
+        help="Whether the callbacks get picklable arguments, as running them in another process requires.")
+
+    def __init__(self, **kwargs):
+        self._callback_options = {}
+        self._init_pools()
+        super().__init__(**kwargs)
+
+    def _init_pools(self):
+        self._lock = threading.Lock()
+        self._running = set()
+        self._pools = {}
+
+    def __getstate__(self):
+        # locks and pools cannot be pickled, they are created anew on unpickling
+        state = super().__getstate__()
+        for name in ('_lock', '_running', '_pools'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._init_pools()
+
+    @validate('executor')
+    def _validate_executor(self, proposal):
+        return self._check_executor(proposal['value'])
+
+    @observe('max_workers')
+    def _max_workers_changed(self, change):
+        # the pools are sized on creation, new ones are made when next needed
+        self.shutdown(wait=False)
+
+    def _check_executor(self, executor):
+        if executor not in _EXECUTOR_POLICIES and not isinstance(executor, futures.Executor):
+            raise ValueError("executor must be one of %r or a concurrent.futures.Executor, not %r"
+                             % (_EXECUTOR_POLICIES, executor))
+        if not self.picklable_args and (executor == 'process' or
+                                        isinstance(executor, futures.ProcessPoolExecutor)):
+            raise ValueError("These callbacks get a widget as argument, which cannot be "
+                             "sent to another process; use executor='thread' instead")
+        return executor
 
     def __call__(self, *args, **kwargs):
-        """Call all of the registered callbacks."""
+        """Call all of the registered callbacks.
+
+        Returns the last non-None value returned by a callback run inline.
+        Callbacks run by an executor do not contribute to the return value.
+        """
         value = None
         for callback in self.callbacks:
+            executor, drop_if_running = self._get_options(callback)
+            executor = self._get_executor(self.executor if executor is None else executor)
+            if executor is not None:
+                self._submit(executor, callback, drop_if_running, args, kwargs)
+                continue
             try:
                 local_value = callback(*args, **kwargs)
             except Exception as e:
-                ip = get_ipython()
-                if ip is None:
-                    self.log.warning("Exception in callback %s: %s", callback, e, exc_info=True)
-                else:
-                    ip.showtraceback()
+                self._show_callback_exception(callback, e)
             else:
                 value = local_value if local_value is not None else value
         return value
 
-    def register_callback(self, callback, remove=False):
+    def register_callback(self, callback, remove=False, executor=None, drop_if_running=False):
         """(Un)Register a callback
 
         Parameters
@@ -207,13 +421,105 @@ class CallbackDispatcher(LoggingHasTraits):
         callback: method handle
             Method to be registered or unregistered.
         remove=False: bool
-            Whether to unregister the callback."""
+            Whether to unregister the callback.
+        executor=None: str, concurrent.futures.Executor or None
+            Executor policy for this callback, overriding the dispatcher's
+            ``executor``. See the class documentation for the possible values.
+        drop_if_running=False: bool
+            When the callback is run by an executor, do not run it again while
+            a previous call is still pending or running."""
 
         # (Un)Register the callback.
         if remove and callback in self.callbacks:
             self.callbacks.remove(callback)
-        elif not remove and callback not in self.callbacks:
-            self.callbacks.append(callback)
+            self._drop_options(callback)
+        elif not remove:
+            if executor is not None:
+                self._check_executor(executor)
+            if callback not in self.callbacks:
+                self.callbacks.append(callback)
+            if executor is not None or drop_if_running:
+                # options are looked up by callback, which must be hashable
+                self._callback_options[callback] = (executor, drop_if_running)
+            else:
+                self._drop_options(callback)
+
+    def shutdown(self, wait=True):
+        """Shut down the pools created by this dispatcher."""
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.shutdown(wait=wait)
+
+    def _get_options(self, callback):
+        """Return the executor and drop_if_running options of a callback."""
+        if self._callback_options:
+            try:
+                return self._callback_options.get(callback, (None, False))
+            except TypeError:
+                # unhashable callables cannot have been registered with options
+                pass
+        return None, False
+
+    def _drop_options(self, callback):
+        if self._callback_options:
+            try:
+                self._callback_options.pop(callback, None)
+            except TypeError:
+                pass
+
+    def _get_executor(self, policy):
+        """Return the executor for a policy, or None to run inline."""
+        if policy == 'inline':
+            return None
+        if isinstance(policy, futures.Executor):
+            return policy
+        with self._lock:
+            pool = self._pools.get(policy)
+            if pool is None:
+                if policy == 'thread':
+                    pool = futures.ThreadPoolExecutor(max_workers=self.max_workers,
+                                                      thread_name_prefix='ipywidgets-callback')
+                else:
+                    pool = futures.ProcessPoolExecutor(max_workers=self.max_workers)
+                self._pools[policy] = pool
+        return pool
+
+    def _submit(self, executor, callback, drop_if_running, args, kwargs):
+        # only callbacks with drop_if_running, hence hashable, are tracked
+        if drop_if_running:
+            with self._lock:
+                if callback in self._running:
+                    return
+                self._running.add(callback)
+        try:
+            future = executor.submit(callback, *args, **kwargs)
+        except Exception as e:
+            if drop_if_running:
+                self._callback_finished(callback)
+            self._show_callback_exception(callback, e)
+        else:
+            future.add_done_callback(lambda f: self._callback_done(callback, drop_if_running, f))
+
+    def _callback_done(self, callback, drop_if_running, future):
+        if drop_if_running:
+            self._callback_finished(callback)
+        if future.cancelled():
+            return
+        e = future.exception()
+        if e is not None:
+            self._show_callback_exception(callback, e)
+
+    def _callback_finished(self, callback):
+        with self._lock:
+            self._running.discard(callback)
+
+    def _show_callback_exception(self, callback, e):
+        ip = get_ipython()
+        if ip is None:
+            self.log.warning("Exception in callback %s: %s", callback, e, exc_info=e)
+        else:
+            ip.showtraceback((type(e), e, e.__traceback__))
 
 def _show_traceback(method):
     """decorator for showing tracebacks"""
@@ -492,7 +798,10 @@ class Widget(LoggingHasTraits):
     _property_lock = Dict()
     _holding_sync = False
     _states_to_send = Set()
-    _msg_callbacks = Instance(CallbackDispatcher, ())
+    # Incremented whenever the synced state may have changed, so that things
+    # derived from the state (sizes, serialized forms) can be cached.
+    _state_version = 0
+    _msg_callbacks = Instance(CallbackDispatcher, (), {'picklable_args': False})
 
     #-------------------------------------------------------------------------
     # (Con/de)structor
@@ -555,12 +864,27 @@ class Widget(LoggingHasTraits):
     # Methods
     #-------------------------------------------------------------------------
 
-    def close(self):
+    def close(self, recursive=False):
         """Close method.
 
         Closes the underlying comm.
         When the comm is closed, all of the widget views are automatically
-        removed from the front-end."""
+        removed from the front-end.
+
+        Parameters
+        ----------
+        recursive: bool
+            Also close every widget this widget refers to, directly or
+            indirectly: children, layout, style, etc. Note that referenced
+            widgets are closed even if other widgets still use them, and so
+            are the links (see `jslink`) between the closed widgets."""
+        if recursive:
+            from .widget_link import _links_within
+            tree = _widget_tree(self)
+            links = _links_within({w.model_id for w in tree if w.comm is not None})
+            for widget in tree + links:
+                widget.close()
+            return
         if self.comm is not None:
             _instances.pop(self.model_id, None)
             self.comm.close()
@@ -575,6 +899,8 @@ class Widget(LoggingHasTraits):
         key : unicode, or iterable (optional)
             A single property's name or iterable of property names to sync with the front-end.
         """
+        # an explicit send may follow an in-place mutation of a trait value
+        self._state_version += 1
         state = self.get_state(key=key)
         if len(state) > 0:
             if self._property_lock:  # we need to keep this dict up to date with the front-end values
@@ -609,23 +935,48 @@ class Widget(LoggingHasTraits):
         else:
             raise ValueError("key must be a string, an iterable of keys, or None")
         state = {}
-        traits = self.traits()
+        serialization = self._trait_serialization()
         for k in keys:
-            to_json = self.trait_metadata(k, 'to_json', self._trait_to_json)
+            entry = serialization[k]
+            to_json = entry[1] or self._trait_to_json
             value = to_json(getattr(self, k), self)
-            if not drop_defaults or not self._compare(value, traits[k].default_value):
+            if not drop_defaults or not _json_equal(value, self._default_json(entry)):
                 state[k] = value
         return state
 
+    def _trait_serialization(self):
+        """Return, for each trait of the class, [trait, to_json metadata, serialized default].
+
+        The serialized default is computed on first use, see `_default_json`.
+        """
+        cls = type(self)
+        try:
+            return _serialization_cache[cls]
+        except KeyError:
+            serialization = {name: [trait, trait.metadata.get('to_json'), Undefined]
+                             for name, trait in cls.class_traits().items()}
+            _serialization_cache[cls] = serialization
+            return serialization
+
+    def _default_json(self, entry):
+        """Return the serialized default value of a trait, computed once per class"""
+        if entry[2] is Undefined:
+            trait, to_json = entry[0], entry[1] or self._trait_to_json
+            default = trait.default_value
+            if default is Undefined and isinstance(trait, (Container, Dict)):
+                # containers build their default when first used
+                default = trait.default()
+            try:
+                entry[2] = _NO_DEFAULT if default is Undefined else to_json(default, self)
+            except Exception:
+                entry[2] = _NO_DEFAULT
+        return entry[2]
+
     def _is_numpy(self, x):
-        return x.__class__.__name__ == 'ndarray' and x.__class__.__module__ == 'numpy'
+        return _is_numpy(x)
 
     def _compare(self, a, b):
-        if self._is_numpy(a) or self._is_numpy(b):
-            import numpy as np
-            return np.array_equal(a, b)
-        else:
-            return a == b
+        return _json_equal(a, b)
 
     def set_state(self, sync_data):
         """Called when a state is received from the front-end."""
@@ -666,7 +1017,7 @@ class Widget(LoggingHasTraits):
         """
         self._send({"method": "custom", "content": content}, buffers=buffers)
 
-    def on_msg(self, callback, remove=False):
+    def on_msg(self, callback, remove=False, executor=None, drop_if_running=False):
         """(Un)Register a custom msg receive callback.
 
         Parameters
@@ -677,8 +1028,15 @@ class Widget(LoggingHasTraits):
                 callback(widget, content, buffers)
 
         remove: bool
-            True if the callback should be unregistered."""
-        self._msg_callbacks.register_callback(callback, remove=remove)
+            True if the callback should be unregistered.
+        executor: str, concurrent.futures.Executor or None
+            How to run the callback: ``'inline'`` (default), ``'thread'`` or
+            a thread based executor. See `CallbackDispatcher`.
+        drop_if_running: bool
+            Skip a message if the callback is still busy with a previous one.
+            Only applies when the callback is run by an executor."""
+        self._msg_callbacks.register_callback(callback, remove=remove, executor=executor,
+                                              drop_if_running=drop_if_running)
 
     def add_traits(self, **traits):
         """Dynamically add trait attributes to the Widget."""
@@ -693,6 +1051,8 @@ class Widget(LoggingHasTraits):
         # Send the state to the frontend before the user-registered callbacks
         # are called.
         name = change['name']
+        if name in self.keys:
+            self._state_version += 1
         if self.comm is not None and getattr(self.comm, 'kernel', True) is not None:
             # Make sure this isn't information that the front-end just sent us.
             if name in self.keys and self._should_send_property(name, getattr(self, name)):
@@ -722,6 +1082,13 @@ class Widget(LoggingHasTraits):
         finally:
             self._property_lock = {}
 
+    @contextmanager
+    def hold_trait_notifications(self):
+        """Hold the trait notifications until the block ends, and group the
+        changes made meanwhile into a batch, see `_batch_changes`."""
+        with _batch_changes(), super().hold_trait_notifications():
+            yield
+
     @contextmanager
     def hold_sync(self):
         """Hold syncing any state until the outermost context manager exits"""
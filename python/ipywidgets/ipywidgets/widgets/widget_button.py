@@ -62,7 +62,7 @@ class Button(DOMWidget, CoreWidget):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self._click_handlers = CallbackDispatcher()
+        self._click_handlers = CallbackDispatcher(picklable_args=False)
         self.on_msg(self._handle_button_msg)
 
     @validate('icon')
@@ -76,7 +76,7 @@ class Button(DOMWidget, CoreWidget):
             value = value.replace('fa-', '')
         return value
 
-    def on_click(self, callback, remove=False):
+    def on_click(self, callback, remove=False, executor=None, drop_if_running=False):
         """Register a callback to execute when the button is clicked.
 
         The callback will be called with one argument, the clicked button
@@ -86,8 +86,16 @@ class Button(DOMWidget, CoreWidget):
         ----------
         remove: bool (optional)
             Set to true to remove the callback from the list of callbacks.
+        executor: str, concurrent.futures.Executor or None (optional)
+            How to run the callback: ``'inline'`` (default), ``'thread'`` or
+            a thread based executor. Running a slow callback in a thread keeps
+            the other widgets responsive while it runs.
+        drop_if_running: bool (optional)
+            Ignore clicks while the callback is still running a previous
+            click. Only applies when the callback is run by an executor.
         """
-        self._click_handlers.register_callback(callback, remove=remove)
+        self._click_handlers.register_callback(callback, remove=remove, executor=executor,
+                                               drop_if_running=drop_if_running)
 
     def click(self):
         """Programmatically trigger a click event.
@@ -9,7 +9,10 @@ Propagate changes between widgets on the javascript side.
 from .widget import Widget, register, widget_serialization
 from .widget_core import CoreWidget
 
-from traitlets import Unicode, Tuple, Instance, TraitError
+from traitlets import Unicode, Tuple, Instance, TraitError, observe
+
+# endpoint model id -> set of the links with an endpoint of that model id
+_links_by_endpoint = {}
 
 
 class WidgetTraitTuple(Tuple):
@@ -52,16 +55,57 @@ class Link(CoreWidget):
     target = WidgetTraitTuple(help="The target (widget, 'trait_name') pair").tag(sync=True, **widget_serialization)
     source = WidgetTraitTuple(help="The source (widget, 'trait_name') pair").tag(sync=True, **widget_serialization)
 
+    _endpoint_ids = ()
+
     def __init__(self, source, target, **kwargs):
         kwargs['source'] = source
         kwargs['target'] = target
         super().__init__(**kwargs)
 
+    @observe('source', 'target')
+    def _update_endpoint_index(self, change):
+        ids = set()
+        for endpoint in (self.source, self.target):
+            if endpoint and endpoint[0].comm is not None:
+                ids.add(endpoint[0].model_id)
+        self._set_endpoint_ids(ids)
+
+    def _set_endpoint_ids(self, ids):
+        for model_id in set(self._endpoint_ids) - ids:
+            links = _links_by_endpoint.get(model_id)
+            if links is not None:
+                links.discard(self)
+                if not links:
+                    del _links_by_endpoint[model_id]
+        for model_id in ids:
+            _links_by_endpoint.setdefault(model_id, set()).add(self)
+        self._endpoint_ids = tuple(ids)
+
+    def close(self, recursive=False):
+        self._set_endpoint_ids(set())
+        super().close(recursive=recursive)
+
     # for compatibility with traitlet links
     def unlink(self):
         self.close()
 
 
+def _links_within(model_ids):
+    """Return the open links whose two endpoints are among model_ids.
+
+    This looks up the links by endpoint, so its cost does not depend on the
+    number of widgets in the kernel.
+    """
+    found = {}
+    for model_id in model_ids:
+        for link in list(_links_by_endpoint.get(model_id, ())):
+            if link.comm is None or link.model_id in found:
+                continue
+            if all(endpoint_id in model_ids for endpoint_id in link._endpoint_ids):
+                found[link.model_id] = link
+    return list(found.values())
+
+
 def jslink(attr1, attr2):
     """Link two widget attributes on the frontend so they remain in sync.
 
@@ -6,20 +6,31 @@
 Represents a widget that can be used to display output within the widget area.
 """
 
+import json
 import sys
+from collections import deque
 from functools import wraps
+from itertools import islice
 
 from .domwidget import DOMWidget
 from .trait_types import TypedTuple
 from .widget import register
 from .._version import __jupyter_widgets_output_version__
 
-from traitlets import Unicode, Dict
+from traitlets import Unicode, Dict, Int, observe
 from IPython.core.interactiveshell import InteractiveShell
 from IPython.display import clear_output
 from IPython import get_ipython
 import traceback
 
+
+def _output_size(output):
+    """Size in bytes of an output in its compact JSON form encoded as UTF-8,
+    as counted against max_bytes, like the front-end does."""
+    return len(json.dumps(output, separators=(',', ':'), ensure_ascii=False,
+                          default=str).encode())
+
+
 @register
 class Output(DOMWidget):
     """Widget used as a context manager to display output.
@@ -49,6 +60,14 @@ class Output(DOMWidget):
         @out.capture()
         def func():
             print('prints to output widget')
+
+    For long-running producers, ``max_outputs`` and ``max_bytes`` bound the
+    outputs kept: the oldest outputs are dropped first, and outputs appended
+    from the kernel are sent to the front-end one at a time instead of
+    resending all of them::
+
+        log = widgets.Output(max_outputs=1000)
+        log.append_stdout('epoch 1: loss 0.25\n')
     """
     _view_name = Unicode('OutputView').tag(sync=True)
     _model_name = Unicode('OutputModel').tag(sync=True)
@@ -60,7 +79,18 @@ class Output(DOMWidget):
     msg_id = Unicode('', help="Parent message id of messages to capture").tag(sync=True)
     outputs = TypedTuple(trait=Dict(), help="The output messages synced from the frontend.").tag(sync=True)
 
+    max_outputs = Int(None, allow_none=True, min=1,
+        help="Maximum number of outputs kept, the oldest are dropped first.").tag(sync=True)
+    max_bytes = Int(None, allow_none=True, min=0,
+        help="Maximum total size in bytes of the outputs kept, the oldest are dropped first.").tag(sync=True)
+
     __counter = 0
+    # deques of the outputs and their sizes, the source of truth for outputs
+    # when bounded, or None when they have to be rebuilt from outputs
+    _ring = None
+    _ring_sizes = None
+    _ring_bytes = 0
+    _appending = False
 
     def clear_output(self, *pargs, **kwargs):
         """
@@ -159,9 +189,79 @@ class Output(DOMWidget):
         sys.stdout.flush()
         sys.stderr.flush()
 
+    @observe('outputs', 'max_outputs', 'max_bytes')
+    def _outputs_changed(self, change):
+        if self._appending:
+            return
+        self._ring = None
+        if change['name'] != 'outputs' and self._bounded():
+            # apply the new bounds right away
+            ring = self._get_ring()
+            if len(ring) < len(self.outputs):
+                self.outputs = tuple(ring)
+
+    def _bounded(self):
+        return self.max_outputs is not None or self.max_bytes is not None
+
+    def _get_ring(self):
+        """Return the ring buffer of the outputs, with the bounds applied."""
+        if self._ring is None:
+            self._ring = deque(self.outputs)
+            self._ring_sizes = deque(map(_output_size, self._ring))
+            self._ring_bytes = sum(self._ring_sizes)
+            self._evict()
+        return self._ring
+
+    def _evict(self):
+        """Drop the oldest outputs until the bounds hold, keeping the newest one."""
+        ring, sizes = self._ring, self._ring_sizes
+        max_outputs, max_bytes = self.max_outputs, self.max_bytes
+        while len(ring) > 1 and (
+                (max_outputs is not None and len(ring) > max_outputs) or
+                (max_bytes is not None and self._ring_bytes > max_bytes)):
+            ring.popleft()
+            self._ring_bytes -= sizes.popleft()
+
+    def _append_outputs(self, *outputs):
+        """Append outputs, keeping within max_outputs and max_bytes.
+
+        When bounded, the ring buffer is the source of truth: only the
+        appended outputs are validated, outputs is replaced by a copy of the
+        buffer without validating it again, and only the appended outputs
+        are sent to the front-end, which applies the same bounds on its side.
+        """
+        if not self._bounded():
+            self.outputs += outputs
+            return
+        ring = self._get_ring()
+        trait = type(self).outputs._trait
+        for output in outputs:
+            output = trait.validate(self, output)
+            size = _output_size(output)
+            ring.append(output)
+            self._ring_sizes.append(size)
+            self._ring_bytes += size
+        self._evict()
+        # eviction keeps the newest output, so the tail is never empty
+        tail = list(islice(ring, max(len(ring) - len(outputs), 0), None))
+        pending = 'outputs' in self._states_to_send
+        old = self.outputs
+        self._appending = True
+        try:
+            with self.hold_sync():
+                self._trait_values['outputs'] = tuple(ring)
+                self._notify_trait('outputs', old, self._trait_values['outputs'])
+                if not pending:
+                    # the front-end only needs the tail, sent below
+                    self._states_to_send.discard('outputs')
+        finally:
+            self._appending = False
+        if not pending and self.comm is not None:
+            self.send({'method': 'append_outputs', 'outputs': tail})
+
     def _append_stream_output(self, text, stream_name):
         """Append a stream output."""
-        self.outputs += (
+        self._append_outputs(
             {'output_type': 'stream', 'name': stream_name, 'text': text},
         )
 
@@ -184,7 +284,7 @@ class Output(DOMWidget):
         """
         fmt = InteractiveShell.instance().display_formatter.format
         data, metadata = fmt(display_object)
-        self.outputs += (
+        self._append_outputs(
             {
                 'output_type': 'display_data',
                 'data': data,
@@ -97,8 +97,24 @@ _doc_snippets['slider_params'] = """
 """
 
 
+def _is_array(x):
+    """Whether x is a one-dimensional NumPy array or pandas Index or Series
+    whose values can be converted at once.
+
+    Datetimes are left out, since their conversion does not match iteration,
+    and so are objects, which may be (label, value) pairs.
+    """
+    module = type(x).__module__.partition('.')[0]
+    if module not in ('numpy', 'pandas') or getattr(x, 'ndim', None) != 1:
+        return False
+    return getattr(getattr(x, 'dtype', None), 'kind', None) in ('b', 'i', 'u', 'f', 'c', 'U', 'S')
+
+
 def _exhaust_iterable(x):
     """Exhaust any non-mapping iterable into a tuple"""
+    if _is_array(x):
+        # converted to Python values at once rather than one by one
+        return tuple(x.tolist())
     if isinstance(x, Iterable) and not isinstance(x, Mapping):
         return tuple(x)
     return x
@@ -127,6 +143,16 @@ def _make_options(x):
     # Otherwise, assume x is an iterable of values
     return tuple((str(i), i) for i in xlist)
 
+def _full_options(widget, options):
+    """Standardize the options set on a selection widget.
+
+    The options given to the constructor were already standardized, so they
+    are not converted again when they are set.
+    """
+    if options is widget._options_init:
+        return widget._options_full
+    return _make_options(options)
+
 def findvalue(array, value, compare = lambda x, y: x == y):
     "A function that uses the compare function to return a value from the list."
     try:
@@ -161,6 +187,7 @@ class _Selection(DescriptionWidget, ValueWidget, CoreWidget):
     """)
 
     _options_full = None
+    _options_init = None
 
     # This being read-only means that it cannot be changed by the user.
     _options_labels = TypedTuple(trait=Unicode(), read_only=True, help="The labels for the options.").tag(sync=True)
@@ -174,6 +201,7 @@ class _Selection(DescriptionWidget, ValueWidget, CoreWidget):
         self._initializing_traits_ = True
         kwargs['options'] = _exhaust_iterable(kwargs.get('options', ()))
         self._options_full = _make_options(kwargs['options'])
+        self._options_init = kwargs['options']
         self._propagate_options(None)
 
         # Select the first item by default, if we can
@@ -185,13 +213,14 @@ class _Selection(DescriptionWidget, ValueWidget, CoreWidget):
 
         super().__init__(*args, **kwargs)
         self._initializing_traits_ = False
+        self._options_init = None
 
     @validate('options')
     def _validate_options(self, proposal):
         # if an iterator is provided, exhaust it
         proposal.value = _exhaust_iterable(proposal.value)
         # throws an error if there is a problem converting to full form
-        self._options_full = _make_options(proposal.value)
+        self._options_full = _full_options(self, proposal.value)
         return proposal.value
 
     @observe('options')
@@ -238,7 +267,12 @@ class _Selection(DescriptionWidget, ValueWidget, CoreWidget):
     @validate('value')
     def _validate_value(self, proposal):
         value = proposal.value
+        index = self.index
         try:
+            if (value is not None and index is not None and index < len(self._options_values)
+                    and self.equals(self._options_values[index], value)):
+                # typically set from the index, no need to look it up
+                return self._options_values[index]
             return findvalue(self._options_values, value, self.equals) if value is not None else None
         except ValueError:
             raise TraitError('Invalid selection: value not found')
@@ -307,6 +341,7 @@ class _MultipleSelection(DescriptionWidget, ValueWidget, CoreWidget):
     actual Python choices, and should be unique.
     """)
     _options_full = None
+    _options_init = None
 
     # This being read-only means that it cannot be changed from the frontend!
     _options_labels = TypedTuple(trait=Unicode(), read_only=True, help="The labels for the options.").tag(sync=True)
@@ -321,16 +356,18 @@ class _MultipleSelection(DescriptionWidget, ValueWidget, CoreWidget):
         self._initializing_traits_ = True
         kwargs['options'] = _exhaust_iterable(kwargs.get('options', ()))
         self._options_full = _make_options(kwargs['options'])
+        self._options_init = kwargs['options']
         self._propagate_options(None)
 
         super().__init__(*args, **kwargs)
         self._initializing_traits_ = False
+        self._options_init = None
 
     @validate('options')
     def _validate_options(self, proposal):
         proposal.value = _exhaust_iterable(proposal.value)
         # throws an error if there is a problem converting to full form
-        self._options_full = _make_options(proposal.value)
+        self._options_full = _full_options(self, proposal.value)
         return proposal.value
 
     @observe('options')
@@ -535,7 +572,7 @@ class _SelectionNonempty(_Selection):
     @validate('options')
     def _validate_options(self, proposal):
         proposal.value = _exhaust_iterable(proposal.value)
-        self._options_full = _make_options(proposal.value)
+        self._options_full = _full_options(self, proposal.value)
         if len(self._options_full) == 0:
             raise TraitError("Option list must be nonempty")
         return proposal.value
@@ -559,7 +596,7 @@ class _MultipleSelectionNonempty(_MultipleSelection):
     def _validate_options(self, proposal):
         proposal.value = _exhaust_iterable(proposal.value)
         # throws an error if there is a problem converting to full form
-        self._options_full = _make_options(proposal.value)
+        self._options_full = _full_options(self, proposal.value)
         if len(self._options_full) == 0:
             raise TraitError("Option list must be nonempty")
         return proposal.value
@@ -116,7 +116,7 @@ class Text(_String):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._submission_callbacks = CallbackDispatcher()
+        self._submission_callbacks = CallbackDispatcher(picklable_args=False)
         self.on_msg(self._handle_string_msg)
 
     def _handle_string_msg(self, _, content, buffers):
@@ -130,7 +130,7 @@ class Text(_String):
         if content.get('event', '') == 'submit':
             self._submission_callbacks(self)
 
-    def on_submit(self, callback, remove=False):
+    def on_submit(self, callback, remove=False, executor=None, drop_if_running=False):
         """(Un)Register a callback to handle text submission.
 
         Triggered when the user clicks enter.
@@ -141,9 +141,16 @@ class Text(_String):
             Will be called with exactly one argument: the Widget instance
         remove: bool (optional)
             Whether to unregister the callback
+        executor: str, concurrent.futures.Executor or None (optional)
+            How to run the callback: ``'inline'`` (default), ``'thread'`` or
+            a thread based executor. See `CallbackDispatcher`.
+        drop_if_running: bool (optional)
+            Ignore submissions while the callback is still running a previous
+            one. Only applies when the callback is run by an executor.
         """
         deprecation("on_submit is deprecated. Instead, set the .continuous_update attribute to False and observe the value changing with: mywidget.observe(callback, 'value').")
-        self._submission_callbacks.register_callback(callback, remove=remove)
+        self._submission_callbacks.register_callback(callback, remove=remove, executor=executor,
+                                                     drop_if_running=drop_if_running)
 
 
 @register
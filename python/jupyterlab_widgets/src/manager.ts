@@ -187,13 +187,15 @@ export abstract class LabWidgetManager
     moduleName: string,
     moduleVersion: string
   ): Promise<typeof WidgetModel | typeof WidgetView> {
-    // Special-case the Jupyter base and controls packages. If we have just a
-    // plain version, with no indication of the compatible range, prepend a ^ to
-    // get all compatible versions. We may eventually apply this logic to all
-    // widget modules. See issues #2006 and #2017 for more discussion.
+    // Special-case the Jupyter base, controls and output packages. If we have
+    // just a plain version, with no indication of the compatible range,
+    // prepend a ^ to get all compatible versions. We may eventually apply this
+    // logic to all widget modules. See issues #2006 and #2017 for more
+    // discussion.
     if (
       (moduleName === '@jupyter-widgets/base' ||
-        moduleName === '@jupyter-widgets/controls') &&
+        moduleName === '@jupyter-widgets/controls' ||
+        moduleName === '@jupyter-widgets/output') &&
       valid(moduleVersion)
     ) {
       moduleVersion = `^${moduleVersion}`;
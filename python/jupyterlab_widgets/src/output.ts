@@ -19,6 +19,48 @@ import $ from 'jquery';
 
 export const OUTPUT_WIDGET_VERSION = outputBase.OUTPUT_WIDGET_VERSION;
 
+/**
+ * An output area model which can hold the outputs of a bounded output widget
+ * one to one: pushed outputs are not merged into the previous stream output,
+ * and the oldest outputs can be removed.
+ */
+class BoundedOutputAreaModel extends OutputAreaModel {
+  /**
+   * Append an output as an item of its own. Returns whether the outputs
+   * were cleared first, after a clear waiting for the next output.
+   */
+  push(output: nbformat.IOutput): boolean {
+    const cleared = this.clearNext;
+    if (cleared) {
+      this.clear();
+      this.clearNext = false;
+    }
+    const value = JSON.parse(JSON.stringify(output));
+    if (nbformat.isStream(value) && typeof value.text !== 'string') {
+      value.text = value.text.join('');
+    }
+    this.list.push(
+      this.contentFactory.createOutputModel({ value, trusted: this.trusted })
+    );
+    return cleared;
+  }
+
+  /**
+   * Remove the oldest outputs.
+   */
+  removeOldest(count: number): void {
+    count = Math.min(count, this.length);
+    if (count === 0) {
+      return;
+    }
+    const removed = Array.from({ length: count }, (_, i) => this.list.get(i));
+    this.list.removeRange(0, count);
+    for (const item of removed) {
+      item.dispose();
+    }
+  }
+}
+
 export class OutputModel extends outputBase.OutputModel {
   defaults(): Backbone.ObjectHash {
     return { ...super.defaults(), msg_id: '', outputs: [] };
@@ -27,7 +69,7 @@ export class OutputModel extends outputBase.OutputModel {
   initialize(attributes: any, options: any): void {
     super.initialize(attributes, options);
     // The output area model is trusted since widgets are only rendered in trusted contexts.
-    this._outputs = new OutputAreaModel({ trusted: true });
+    this._outputs = new BoundedOutputAreaModel({ trusted: true });
     this._msgHook = (msg): boolean => {
       this.add(msg);
       return false;
@@ -43,9 +85,39 @@ export class OutputModel extends outputBase.OutputModel {
     }
     this.listenTo(this, 'change:msg_id', this.reset_msg_id);
     this.listenTo(this, 'change:outputs', this.setOutputs);
+    this.listenTo(this, 'msg:custom', this._handleMessage);
     this.setOutputs();
   }
 
+  /**
+   * Handle the outputs appended from the kernel, which only sends the new
+   * ones when max_outputs or max_bytes is set.
+   */
+  private _handleMessage(content: any): void {
+    if (content.method === 'append_outputs') {
+      for (const output of content.outputs) {
+        this._addOutput(output);
+      }
+      this.set('outputs', this._outputs.toJSON(), { newMessage: true });
+    }
+  }
+
+  /**
+   * Add an output. When max_outputs or max_bytes is set, the outputs are
+   * kept one to one with the outputs of the kernel, and the oldest ones
+   * beyond the bounds are removed.
+   */
+  private _addOutput(output: nbformat.IOutput): void {
+    if (!this.isBounded()) {
+      this._outputs.add(output);
+      return;
+    }
+    if (this._outputs.push(output)) {
+      this.resetBounds([]);
+    }
+    this._outputs.removeOldest(this.appendBounded(output));
+  }
+
   /**
    * Register a new kernel
    */
@@ -87,7 +159,7 @@ export class OutputModel extends outputBase.OutputModel {
       case 'error': {
         const model = msg.content as nbformat.IOutput;
         model.output_type = msgType as nbformat.OutputType;
-        this._outputs.add(model);
+        this._addOutput(model);
         break;
       }
       case 'clear_output':
@@ -102,6 +174,9 @@ export class OutputModel extends outputBase.OutputModel {
 
   clear_output(wait = false): void {
     this._outputs.clear(wait);
+    if (!wait) {
+      this.resetBounds([]);
+    }
   }
 
   get outputs(): OutputAreaModel {
@@ -112,15 +187,23 @@ export class OutputModel extends outputBase.OutputModel {
     if (!(options && options.newMessage)) {
       // fromJSON does not clear the existing output
       this.clear_output();
-      // fromJSON does not copy the message, so we make a deep copy
-      this._outputs.fromJSON(JSON.parse(JSON.stringify(this.get('outputs'))));
+      const outputs = this.get('outputs');
+      if (this.isBounded()) {
+        for (const output of outputs) {
+          this._outputs.push(output);
+        }
+      } else {
+        // fromJSON does not copy the message, so we make a deep copy
+        this._outputs.fromJSON(JSON.parse(JSON.stringify(outputs)));
+      }
+      this.resetBounds(outputs);
     }
   }
 
   widget_manager: LabWidgetManager;
 
   private _msgHook: (msg: KernelMessage.IIOPubMessage) => boolean;
-  private _outputs: OutputAreaModel;
+  private _outputs: BoundedOutputAreaModel;
 }
 
 export class OutputView extends outputBase.OutputView {
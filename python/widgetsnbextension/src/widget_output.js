@@ -11,6 +11,64 @@ var outputArea = new Promise(function (resolve, reject) {
   requirejs(['notebook/js/outputarea'], resolve, reject);
 });
 
+// Append an output to a classic output area by calling append. When the model
+// is bounded, a stream output is appended as an output of its own rather than
+// merged into the previous stream output, so that the outputs of the area
+// match the outputs of the kernel one to one.
+function appendOutput(model, output_area, output_type, append) {
+  if (!model.isBounded() || output_type !== 'stream') {
+    append();
+    return;
+  }
+  if (output_area.clear_queued) {
+    output_area.clear_output(false);
+  }
+  // append_stream only merges into the last of the recorded outputs
+  var outputs = output_area.outputs;
+  output_area.outputs = [];
+  try {
+    append();
+  } finally {
+    outputs.push.apply(outputs, output_area.outputs);
+    output_area.outputs = outputs;
+  }
+}
+
+// Append outputs to a classic output area, one to one with the outputs of
+// the kernel when the model is bounded.
+function setOutputArea(model, output_area, outputs) {
+  // fromJSON does not copy the message, so we make a deep copy
+  outputs = JSON.parse(JSON.stringify(outputs));
+  if (!model.isBounded()) {
+    output_area.fromJSON(outputs);
+    return;
+  }
+  outputs.forEach(function (output) {
+    appendOutput(model, output_area, output.output_type, function () {
+      output_area.append_output(output);
+    });
+  });
+}
+
+// Remove the oldest outputs of a classic output area, along with their
+// elements.
+function removeOldest(output_area, count) {
+  count = Math.min(count, output_area.outputs.length);
+  if (count === 0) {
+    return;
+  }
+  output_area.outputs.splice(0, count);
+  output_area.element.children().slice(0, count).remove();
+  // the targets of the display ids refer to the outputs by index
+  var targets = output_area._display_id_targets;
+  Object.keys(targets).forEach(function (display_id) {
+    targets[display_id] = targets[display_id].filter(function (target) {
+      target.index -= count;
+      return target.index >= 0;
+    });
+  });
+}
+
 export class OutputModel extends outputBase.OutputModel {
   defaults() {
     return {
@@ -28,6 +86,15 @@ export class OutputModel extends outputBase.OutputModel {
       this.kernel = this.comm.kernel;
       this.kernel.set_callbacks_for_msg(this.model_id, this.callbacks(), false);
     }
+    // The sizes of the outputs are tracked here rather than in the output
+    // areas, which may not exist yet, so the model and its views drop the
+    // same number of outputs.
+    this.listenTo(this, 'change:outputs', function (model, value, options) {
+      if (!(options && options.newMessage)) {
+        this.resetBounds(value);
+      }
+    });
+    this.resetBounds(this.get('outputs'));
 
     var that = this;
     // Create an output area to handle the data model part
@@ -42,13 +109,26 @@ export class OutputModel extends outputBase.OutputModel {
       that.listenTo(
         that,
         'new_message',
-        function (msg) {
-          that.output_area.handle_output(msg);
+        function (msg, count) {
+          appendOutput(
+            that,
+            that.output_area,
+            msg.header.msg_type,
+            function () {
+              that.output_area.handle_output(msg);
+            }
+          );
+          removeOldest(that.output_area, count);
           that.set('outputs', that.output_area.toJSON(), { newMessage: true });
           that.save_changes();
         },
         that
       );
+      that.listenTo(that, 'append_outputs', function (outputs, count) {
+        setOutputArea(that, that.output_area, outputs);
+        removeOldest(that.output_area, count);
+        that.set('outputs', that.output_area.toJSON(), { newMessage: true });
+      });
       that.listenTo(that, 'clear_output', function (msg) {
         that.output_area.handle_clear_output(msg);
         that.set('outputs', that.output_area.toJSON(), { newMessage: true });
@@ -57,6 +137,21 @@ export class OutputModel extends outputBase.OutputModel {
       that.listenTo(that, 'change:outputs', that.setOutputs);
       that.setOutputs();
     });
+    // The kernel only sends the new outputs when max_outputs or max_bytes
+    // is set.
+    this.on(
+      'msg:custom',
+      function (content) {
+        if (content.method === 'append_outputs') {
+          var count = 0;
+          content.outputs.forEach(function (output) {
+            count += this._appendBounded(output);
+          }, this);
+          this.trigger('append_outputs', content.outputs, count);
+        }
+      },
+      this
+    );
   }
 
   // make callbacks
@@ -67,12 +162,24 @@ export class OutputModel extends outputBase.OutputModel {
     var iopubCallbacks = {
       ...iopub,
       output: function (msg) {
-        this.trigger('new_message', msg);
+        var count = 0;
+        if (msg.header.msg_type !== 'update_display_data') {
+          count = this._appendBounded({
+            output_type: msg.header.msg_type,
+            ...msg.content,
+          });
+        }
+        this.trigger('new_message', msg, count);
         if (iopub.output) {
           iopub.output.apply(this, arguments);
         }
       }.bind(this),
       clear_output: function (msg) {
+        if (msg.content.wait) {
+          this._clearQueued = true;
+        } else {
+          this.resetBounds([]);
+        }
         this.trigger('clear_output', msg);
         if (iopub.clear_output) {
           iopub.clear_output.apply(this, arguments);
@@ -82,6 +189,17 @@ export class OutputModel extends outputBase.OutputModel {
     return { ...cb, iopub: iopubCallbacks };
   }
 
+  // Track an appended output when bounded, and return how many of the oldest
+  // outputs have to be dropped.
+  _appendBounded(output) {
+    if (this._clearQueued) {
+      // the outputs are cleared before this one is appended
+      this._clearQueued = false;
+      this.resetBounds([]);
+    }
+    return this.isBounded() ? this.appendBounded(output) : 0;
+  }
+
   reset_msg_id() {
     var kernel = this.kernel;
     // Pop previous message id
@@ -108,10 +226,7 @@ export class OutputModel extends outputBase.OutputModel {
     if (!(options && options.newMessage)) {
       // fromJSON does not clear the existing output
       this.output_area.clear_output();
-      // fromJSON does not copy the message, so we make a deep copy
-      this.output_area.fromJSON(
-        JSON.parse(JSON.stringify(this.get('outputs')))
-      );
+      setOutputArea(this, this.output_area, this.get('outputs'));
     }
   }
 }
@@ -132,11 +247,23 @@ export class OutputView extends outputBase.OutputView {
       that.listenTo(
         that.model,
         'new_message',
-        function (msg) {
-          that.output_area.handle_output(msg);
+        function (msg, count) {
+          appendOutput(
+            that.model,
+            that.output_area,
+            msg.header.msg_type,
+            function () {
+              that.output_area.handle_output(msg);
+            }
+          );
+          removeOldest(that.output_area, count);
         },
         that
       );
+      that.listenTo(that.model, 'append_outputs', function (outputs, count) {
+        setOutputArea(that.model, that.output_area, outputs);
+        removeOldest(that.output_area, count);
+      });
       that.listenTo(that.model, 'clear_output', function (msg) {
         that.output_area.handle_clear_output(msg);
         // fake the event on the output area element. This can be
@@ -156,10 +283,7 @@ export class OutputView extends outputBase.OutputView {
     if (!(options && options.newMessage)) {
       // fromJSON does not clear the existing output
       this.output_area.clear_output();
-      // fromJSON does not copy the message, so we make a deep copy
-      this.output_area.fromJSON(
-        JSON.parse(JSON.stringify(this.model.get('outputs')))
-      );
+      setOutputArea(this.model, this.output_area, this.model.get('outputs'));
     }
   }
 }